@@ -0,0 +1,287 @@
+"""
+Compare schema extraction with the hand-written find/select_one extraction
+
+    python -m benchmarks.extraction_bench [--pages 200] [--page-filler 50] [--listing-size 300]
+
+Pages come from benchmarks.markup and are parsed once up front (with each
+platform's regions, unless LETCTF_FULL_PARSE=1), so only extraction is timed.
+The legacy_* functions below are the lookups get_challenge performed before
+the platforms moved to src.utils.extraction, returning the same fields as
+the schemas; the report gives both timings per page and whether the
+extracted fields are identical.
+"""
+import unicodedata
+import argparse
+import time
+import json
+import sys
+import re
+
+from src.utils.html_parser import parse_html
+from src.platforms.hackropole import HackropolePlatform
+from src.platforms.theblackside import TheBlackSidePlatform
+from src.platforms.crackmes import CrackmesPlatform
+from src.platforms.crackmy import CrackmyPlatform
+from src.platforms.cattheflag import CatTheFlagPlatform
+from src.platforms.imaginaryctf import ImaginaryCTFPlatform
+from src.platforms.rootme import RootMePlatform
+from src.platforms.ecsc import ECSCPlatform
+from . import markup
+
+FILE_HASH = "0" * 64
+
+
+def legacy_hackropole(soup):
+    nfkd = lambda text: unicodedata.normalize("NFKD", text)
+    files = []
+    for element in soup.select(".list-file li"):
+        hash_element = element.select_one(".clip-sha256")
+        files.append({
+            "link": element.select_one("a")["href"],
+            "download": element.select_one("a").get("download"),
+            "hash": hash_element.get_text(strip=True) if hash_element else None,
+        })
+    return {
+        "title": nfkd(soup.select_one(".jumbotron h1").get_text(strip=True)),
+        "badges": [nfkd(badge.get_text(strip=True)) for badge in soup.select(".jumbotron .badge")],
+        "description": nfkd(soup.select_one(".markdown p").get_text(strip=True)),
+        "files": files,
+        "author_name": nfkd(soup.select_one(".col.text-center .font-monospace").get_text(strip=True)),
+        "author_avatar": soup.select_one(".col.text-center img")["src"],
+        "stars": [star.select_one("title").get_text(strip=True) for star in soup.select("svg.text-warning")],
+    }
+
+
+def legacy_theblackside(soup):
+    main = soup.find('main')
+    author_link = main.find('a', href=re.compile(r'/profil/'))
+    metadata_div = main.find('div', class_='metadata')
+    category_button = metadata_div.find('a', href=re.compile(r'/challenges/'))
+    return {
+        "title": main.find('h1').text.strip(),
+        "description": main.find('p').text.strip(),
+        "author_name": author_link.find('span').find('a').text.strip() if author_link else None,
+        "buttons": [
+            {"value": div.find('span').text.strip(), "solved_icon": bool(div.find('svg', class_='feather-check-circle'))}
+            for div in metadata_div.find_all('div', class_='button')
+        ],
+        "category": category_button.find('span').text.strip() if category_button else "Uncategorized",
+        "file_url": main.find('a', class_='startChall')['href'],
+    }
+
+
+def legacy_crackmes(soup):
+    container = soup.find('div', class_='container grid-lg wrapper')
+    author_element = container.find('a', href=re.compile(r'/user/'))
+    title_element = container.find('h3')
+    description_element = container.find('span', style='white-space: pre-line')
+    download_link = soup.find('a', class_='btn-download')
+    return {
+        "author_name": author_element.text if author_element else None,
+        "title": title_element.text.strip() if title_element else None,
+        "description": description_element.text.strip() if description_element else None,
+        "download_link": download_link['href'] if download_link else None,
+        "columns": [
+            {"p": (p.text.strip(), p.find('br').next_sibling.strip()) if p else None}
+            for p in (column.find('p') for column in container.find_all('div', class_='column'))
+        ],
+    }
+
+
+def legacy_crackmy(response):
+    return {
+        "title": response['title'],
+        "author_name": response['author']['name'],
+        "description": response['description'],
+        "os": response['os'],
+        "architecture": response['architecture'],
+        "quality": response['qualityRating'],
+        "category": response['category'],
+        "rating": response['rating'],
+        "difficulty": response["difficulty"],
+        "difficulty_rating": response["difficultyRating"],
+        "file_id": response['file']["id"],
+        "file_name": response["file"]["fileName"],
+        "file_hash": response["file"]["fileSha256"],
+    }
+
+
+def legacy_cattheflag(soup):
+    author_link = soup.find('a', href=lambda x: x and 'page_membre.php' in x)
+    file_link = soup.find('a', href=lambda x: x and 'cdn.cattheflag.org' in x)
+    return {
+        "title": soup.find('h1').text.strip(),
+        "description": soup.find('p', style='color:white').text.strip(),
+        "author_name": author_link.text.strip() if author_link else None,
+        "file_url": file_link['href'] if file_link else None,
+    }
+
+
+def _cattheflag_rows(sections):
+    return [
+        (section["category"], [[cell.text.strip() for cell in row["cells"]] for row in section["rows"][1:]])
+        for section in sections
+    ]
+
+
+def legacy_cattheflag_listing(soup):
+    return [
+        (section.find('h3').text.strip(),
+         [[col.text.strip() for col in row.find_all(['th', 'td'])] for row in section.find('table').find_all('tr')[1:]])
+        for section in soup.find_all('div', class_='challeng__wrap')
+    ]
+
+
+def schema_cattheflag_listing(soup):
+    return _cattheflag_rows(CatTheFlagPlatform.listing_schema.extract(soup)["sections"])
+
+
+def legacy_imaginaryctf_listing(soup):
+    modals = {div['id']: div for div in soup.find_all('div', id=True)}
+
+    def is_header_or_card(tag):
+        if tag.name == 'h3':
+            return 'text-start' in tag.get('class', [])
+        return tag.name == 'div' and ' '.join(tag.get('class', [])) == 'card challenge'
+
+    records = []
+    category = None
+    for element in soup.find_all(is_header_or_card):
+        if element.name == 'h3':
+            category = element.text.strip()
+            continue
+        modal = modals[element.find('a')['data-bs-target'].replace('#', '')]
+        modal_title = modal.find('h5', class_='modal-title')
+        attachments_section = modal.find('b', string='Attachments')
+        records.append((
+            category,
+            element.find('div', class_='challenge-header').text.strip(),
+            modal_title.find('small', class_='text-muted').text.replace('by', '').strip(),
+            int(modal_title.find('span').text.split('solves')[0].strip('- ')),
+            modal.find('p').text.strip(),
+            [a['href'] for a in attachments_section.find_next('p').find_all('a')] if attachments_section else [],
+        ))
+    return records
+
+
+def schema_imaginaryctf_listing(soup):
+    platform = ImaginaryCTFPlatform
+    listing = platform.listing_schema.extract(soup)
+    modals = {modal['id']: modal for modal in listing["modals"]}
+    records = []
+    category = None
+    for element in listing["headers_and_cards"]:
+        if element.name == 'h3':
+            category = element.text.strip()
+            continue
+        card = platform.card_schema.extract(element)
+        details = platform.modal_schema.extract(modals[card["target"].replace('#', '')])
+        records.append((category, card["header"], details["author"], details["solve_count"],
+                        details["description"], details["files"]))
+    return records
+
+
+def legacy_rootme(soup):
+    completion_div = soup.find('span', {'class': 'left gras'})
+    return {
+        "title": soup.find('h1', {'class': 'challenge-titre-41'}).text.strip(),
+        "author": soup.find('a', {'class': 'txt_0minirezo'}).text.strip(),
+        "points": soup.find('h2', {'class': 'challenge-score-41'}).text.strip(),
+        "description": soup.find('div', {'class': 'challenge-descriptif-41'}).text.strip(),
+        "difficulties": [(a['class'][-1], a['title']) for a in soup.find_all('a', {'class': re.compile(r'difficulte.*')})],
+        "file_links": [link['href'] for link in soup.find_all('a', {'class': 'button small radius'})],
+        "validations": soup.find('a', {'title': 'Qui a validé ?'}).text.strip(),
+        "votes": soup.find('span', {'class': 'notation_valeur'}).text.strip(),
+        "completion_rate": completion_div.text.strip() if completion_div else None,
+    }
+
+
+def legacy_ecsc(soup):
+    description_elem = soup.find('span', string='Description').find_next('span')
+    difficulty_elem = soup.find('span', string='Difficulty').find_next('div', class_='difficulty')
+    provider_elem = soup.find('span', string='Provider').find_next('span')
+    tags_elem = soup.find('span', string='Tags').find_next('span', class_='challenge-tags')
+    other_files_elem = soup.find('span', string='Other artefacts').find_next('ul', class_='other-artefacts')
+    additional_info_elem = soup.find('span', string='Additional Info').find_next('span')
+    return {
+        "title": soup.find('h1', class_='documentFirstHeading').text.strip(),
+        "description": description_elem.text.strip() if description_elem else "",
+        "difficulty": difficulty_elem.find('span').text.strip() if difficulty_elem else "Unknown",
+        "author": provider_elem.text.strip() if provider_elem else "Unknown",
+        "category": tags_elem.find('span').text.strip() if tags_elem else "Uncategorized",
+        "other_files": [(a.text.strip(), a['href']) for a in other_files_elem.find_all('a')] if other_files_elem else [],
+        "event": soup.find('span', string='Event').find_next('span').text.strip(),
+        "extra": additional_info_elem.text.strip() if additional_info_elem else "",
+    }
+
+
+def challenge_case(platform, build, legacy):
+    def pages(count, page_filler, listing_size):
+        return [
+            parse_html(build(n, page_filler), platform.html_parser, regions=platform.challenge_regions)
+            for n in range(count)
+        ]
+    return pages, legacy, platform.challenge_schema.extract
+
+
+def listing_case(platform, build, legacy, schema):
+    def pages(count, page_filler, listing_size):
+        # One listing is enough work on its own; repeat it a few times for stable timings
+        page = parse_html(build(listing_size), platform.html_parser, regions=getattr(platform, "listing_regions", None))
+        return [page] * max(1, count // 50)
+    return pages, legacy, schema
+
+
+CASES = {
+    "hackropole": challenge_case(
+        HackropolePlatform, lambda n, filler: markup.hackropole_challenge(n, FILE_HASH, filler), legacy_hackropole),
+    "theblackside": challenge_case(TheBlackSidePlatform, markup.theblackside_challenge, legacy_theblackside),
+    "crackmes": challenge_case(CrackmesPlatform, markup.crackmes_challenge, legacy_crackmes),
+    "crackmy": (
+        lambda count, page_filler, listing_size: [markup.crackmy_challenge(n, FILE_HASH) for n in range(count)],
+        legacy_crackmy, CrackmyPlatform.challenge_schema.extract,
+    ),
+    "cattheflag": challenge_case(CatTheFlagPlatform, markup.cattheflag_challenge, legacy_cattheflag),
+    "cattheflag-listing": listing_case(
+        CatTheFlagPlatform, markup.cattheflag_listing, legacy_cattheflag_listing, schema_cattheflag_listing),
+    "imaginaryctf-listing": listing_case(
+        ImaginaryCTFPlatform, markup.imaginaryctf_listing, legacy_imaginaryctf_listing, schema_imaginaryctf_listing),
+    "rootme": challenge_case(RootMePlatform, markup.rootme_challenge, legacy_rootme),
+    "ecsc": challenge_case(ECSCPlatform, markup.ecsc_challenge, legacy_ecsc),
+}
+
+
+def timed(extract, pages):
+    start = time.perf_counter()
+    extracted = [extract(page) for page in pages]
+    return (time.perf_counter() - start) / len(pages), extracted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--page-filler", type=int, default=50)
+    parser.add_argument("--listing-size", type=int, default=300)
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    args = parser.parse_args()
+
+    report = {}
+    for name in args.cases:
+        build_pages, legacy, schema = CASES[name]
+        pages = build_pages(args.pages, args.page_filler, args.listing_size)
+        legacy_seconds, legacy_fields = timed(legacy, pages)
+        schema_seconds, schema_fields = timed(schema, pages)
+        report[name] = {
+            "legacy_ms": legacy_seconds * 1000,
+            "schema_ms": schema_seconds * 1000,
+            "speedup": legacy_seconds / schema_seconds,
+            "identical": legacy_fields == schema_fields,
+        }
+        result = report[name]
+        print(f"{name}: legacy={result['legacy_ms']:.3f}ms schema={result['schema_ms']:.3f}ms "
+              f"x{result['speedup']:.2f}{'' if result['identical'] else ' (DIFFERS)'}", file=sys.stderr)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Scaling test of the listing parsers on synthetic catalogs
+
+    python -m benchmarks.listing_scaling [--sizes 100 1000 5000 50000] [--max-seconds 60] [--plot scaling.png]
+
+For every size N a listing page with N challenges is generated in the
+platform's real markup (benchmarks.markup), served from memory, and parsed by
+get_challenges. Wall time and tracemalloc peak (from a second, untimed run) are recorded, together with the
+growth exponent between consecutive sizes: about 1 for a linear parser, 2 for
+a quadratic one. Sizes after the first run longer than --max-seconds are
+skipped. With matplotlib installed, --plot draws time and memory against N.
+"""
+from typing import Callable, Dict
+from requests.adapters import HTTPAdapter
+from requests.models import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+import contextlib
+import tracemalloc
+import argparse
+import tempfile
+import math
+import time
+import json
+import sys
+import io
+import os
+
+from src.platforms.imaginaryctf import ImaginaryCTFPlatform
+from src.platforms.cattheflag import CatTheFlagPlatform
+from . import markup
+
+DEFAULT_SIZES = [100, 500, 1000, 5000, 10000, 50000]
+SUPERLINEAR_EXPONENT = 1.3
+
+
+class StaticAdapter(HTTPAdapter):
+    """Answer every request with the page of the first matching URL fragment"""
+    def __init__(self, routes: Dict[str, bytes]):
+        super().__init__()
+        self.routes = routes
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        body = next((page for fragment, page in self.routes.items() if fragment in request.url), b"")
+        response = Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict({"Content-Type": "text/html; charset=utf-8"})
+        response.raw = io.BytesIO(body)
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+
+def with_routes(cls, routes: Dict[str, bytes]):
+    class Static(cls):
+        def _create_session(self):
+            session = super()._create_session()
+            for prefix in ("https://", "http://"):
+                session.mount(prefix, StaticAdapter(routes))
+            return session
+    return Static
+
+
+def imaginaryctf(size: int):
+    routes = {"/Challenges": markup.imaginaryctf_listing(size).encode("utf-8")}
+    return with_routes(ImaginaryCTFPlatform, routes)()
+
+
+def cattheflag(size: int):
+    routes = {
+        "/connexion.php": markup.cattheflag_login().encode("utf-8"),
+        "/defis.php": markup.cattheflag_listing(size).encode("utf-8"),
+    }
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as config:
+        json.dump({"email": "bench@example.org", "password": "bench"}, config)
+    try:
+        return with_routes(CatTheFlagPlatform, routes)(config_file=config.name)
+    finally:
+        os.unlink(config.name)
+
+
+PARSERS: Dict[str, Callable[[int], object]] = {
+    "imaginaryctf": imaginaryctf,
+    "cattheflag": cattheflag,
+}
+
+
+def measure(name: str, size: int, memory: bool = True) -> Dict:
+    """Time get_challenges, then run it again under tracemalloc for its peak memory"""
+    def parse():
+        with contextlib.redirect_stdout(io.StringIO()):
+            platform = PARSERS[name](size)
+        start = time.perf_counter()
+        platform.get_challenges()
+        elapsed = time.perf_counter() - start
+        parsed = len(platform.challenges or {})
+        if parsed != size:
+            raise AssertionError(f"{name}: parsed {parsed} challenges out of {size}")
+        return elapsed
+
+    run = {"size": size, "seconds": parse(), "peak_mb": None}
+    if memory:
+        # tracemalloc slows allocation down, so it is kept out of the timed run
+        tracemalloc.start()
+        parse()
+        run["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return run
+
+
+def exponent(previous: Dict, current: Dict) -> float:
+    return math.log(current["seconds"] / previous["seconds"]) / math.log(current["size"] / previous["size"])
+
+
+def plot(results: Dict, path: str):
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib is not installed, skipping the plot", file=sys.stderr)
+        return
+    fig, (time_ax, memory_ax) = plt.subplots(1, 2, figsize=(11, 4))
+    for name, runs in results.items():
+        sizes = [run["size"] for run in runs]
+        time_ax.loglog(sizes, [run["seconds"] for run in runs], marker="o", label=name)
+        if all(run["peak_mb"] for run in runs):
+            memory_ax.loglog(sizes, [run["peak_mb"] for run in runs], marker="o", label=name)
+    time_ax.set(xlabel="challenges (N)", ylabel="parse time (s)", title="get_challenges time")
+    memory_ax.set(xlabel="challenges (N)", ylabel="tracemalloc peak (MB)", title="get_challenges memory")
+    time_ax.legend()
+    fig.tight_layout()
+    fig.savefig(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--parsers", nargs="+", choices=sorted(PARSERS), default=sorted(PARSERS))
+    parser.add_argument("--max-seconds", type=float, default=60.0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--plot", help="save a time/memory plot to this file (needs matplotlib)")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.parsers:
+        runs = []
+        for size in sorted(args.sizes):
+            run = measure(name, size, memory=not args.no_memory)
+            if runs:
+                run["exponent"] = exponent(runs[-1], run)
+            runs.append(run)
+            flag = "  <- super-linear" if run.get("exponent", 0) > SUPERLINEAR_EXPONENT else ""
+            print(f"{name:>12} N={size:<7} {run['seconds']:9.3f}s {run['peak_mb'] or 0:9.1f} MB"
+                  f"  exponent={run.get('exponent', float('nan')):.2f}{flag}", file=sys.stderr)
+            if run["seconds"] > args.max_seconds:
+                print(f"{name:>12} over {args.max_seconds}s, skipping larger sizes", file=sys.stderr)
+                break
+        results[name] = runs
+
+    if args.plot:
+        plot(results, args.plot)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
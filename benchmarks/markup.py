@@ -0,0 +1,274 @@
+"""
+Pages, API replies and archives in the markup each platform parser expects
+
+Every builder takes an integer n and returns a deterministic document for the
+n-th synthetic challenge, so the stand-in server and the scaling harness can
+produce catalogs of any size.
+"""
+from typing import Dict, Optional
+import functools
+import subprocess
+import tempfile
+import hashlib
+import zipfile
+import random
+import shutil
+import io
+import os
+
+CATEGORIES = ["Web", "Crypto", "Reverse", "Pwn", "Forensics", "Misc"]
+DIFFICULTIES = ["Facile", "Moyen", "Difficile"]
+LOREM = (
+    "Retrouvez le flag caché dans ce binaire. Le programme vérifie une entrée utilisateur "
+    "avant d'afficher un message de succès, mais rien n'est aussi simple qu'il n'y paraît. "
+)
+
+
+def description(n: int, paragraphs: int = 3) -> str:
+    return " ".join(f"{LOREM}(#{n}.{i})" for i in range(paragraphs))
+
+
+def filler(blocks: int) -> str:
+    """Navigation, scripts and footers around the useful part of real pages"""
+    return "\n".join(
+        f'<div class="navbar-item"><a href="/page/{i}">Lien {i}</a><span class="badge">{i}</span>'
+        f'<script>window.__state_{i} = {{"id": {i}, "visible": true}};</script></div>'
+        for i in range(blocks)
+    )
+
+
+# Archives
+
+@functools.lru_cache(maxsize=16)
+def archive(size: int, password: Optional[str] = None, seed: int = 0) -> bytes:
+    """
+    Zip archive holding about size bytes of incompressible data
+
+    With a password the zip command line tool is used to produce a ZipCrypto
+    archive, as zipfile cannot write encrypted members; without it the
+    archive falls back to an unencrypted one.
+    """
+    payload = random.Random(seed).randbytes(size)
+    if password and shutil.which("zip"):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "challenge.bin"), "wb") as f:
+                f.write(payload)
+            subprocess.run(["zip", "-q", "-P", password, "archive.zip", "challenge.bin"], cwd=tmp, check=True)
+            with open(os.path.join(tmp, "archive.zip"), "rb") as f:
+                return f.read()
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as zip_ref:
+        # Fixed timestamp: threads filling the cache at once must build the same bytes
+        zip_ref.writestr(zipfile.ZipInfo("challenge.bin", date_time=(2024, 1, 1, 0, 0, 0)), payload)
+    return buffer.getvalue()
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+# Hackropole
+
+def hackropole_challenge(n: int, file_hash: str, page_filler: int = 50) -> str:
+    category = CATEGORIES[n % len(CATEGORIES)].lower()
+    return f"""<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8"><title>Challenge {n}</title></head>
+<body>{filler(page_filler)}
+<div class="jumbotron"><h1>Challenge {n}</h1>
+<span class="badge">{category}</span><span class="badge">fcsc2023</span><span class="badge">intro</span></div>
+<div class="row"><div class="col text-center"><img src="/avatars/author{n % 17}.png">
+<span class="font-monospace">author{n % 17}</span>
+<svg class="text-warning"><title>star</title></svg><svg class="text-warning"><title>star</title></svg></div></div>
+<div class="markdown"><p>{description(n)}</p></div>
+<ul class="list-file"><li><a href="https://hackropole.fr/challenges/fcsc2023-{n}/public/archive-{n}.zip" download="archive-{n}.zip">archive-{n}.zip</a>
+<span class="clip-sha256">SHA256(archive-{n}.zip) – {file_hash}</span></li></ul>
+{filler(page_filler)}</body></html>"""
+
+
+# TheBlackSide
+
+def theblackside_home() -> str:
+    return '<html><body><a href="/profil/benchmark">Profil</a></body></html>'
+
+
+def theblackside_challenge(n: int, page_filler: int = 50) -> str:
+    category = ["Web", "Stéganographie", "Cryptographie", "Reverse"][n % 4]
+    return f"""<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>{filler(page_filler)}
+<main><h1>Challenge {n}</h1><p>{description(n)}</p>
+<a href="/profil/author{n % 17}"><span><a href="/profil/author{n % 17}">author{n % 17}</a></span></a>
+<div class="metadata"><div class="button"><span>{10 + n % 90}</span></div>
+<div class="button"><svg class="feather-check-circle"></svg><span>{n * 3 % 500}</span></div>
+<a href="/challenges/{category}"><span>{category}</span></a></div>
+<a class="startChall" href="https://theblackside.fr/files/challenge-{n}.zip">Démarrer</a></main>
+{filler(page_filler)}</body></html>"""
+
+
+# Crackmes
+
+def crackmes_challenge(n: int, page_filler: int = 50) -> str:
+    author = f"author{n % 17}"
+    return f"""<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>{filler(page_filler)}
+<div class="container grid-lg wrapper">
+<h3><a href="/user/{author}">{author}</a>'s crackme{n}</h3>
+<div class="columns">
+<div class="column"><p>Language:<br>C/C++</p></div>
+<div class="column"><p>Platform<br>Unix/linux etc.</p></div>
+<div class="column"><p>Arch:<br>x86-64</p></div>
+<div class="column"><p>Quality:<br>{n % 5 + 0.5}</p></div>
+<div class="column"><p>Difficulty:<br>{n % 6 + 0.3}</p></div>
+</div>
+<span style="white-space: pre-line">{description(n)}</span>
+<a class="btn-download" href="/static/crackme/{n:024x}.zip">Download</a>
+</div>{filler(page_filler)}</body></html>"""
+
+
+# Crackmy
+
+def crackmy_challenge(n: int, file_hash: str) -> Dict:
+    return {
+        "title": f"Crackme {n}",
+        "author": {"name": f"author{n % 17}"},
+        "description": description(n),
+        "os": "Linux",
+        "architecture": "x86_64",
+        "qualityRating": n % 5,
+        "category": "Reverse",
+        "rating": n % 10,
+        "difficulty": "Medium",
+        "difficultyRating": n % 10,
+        "file": {"id": f"file-{n}", "fileName": f"crackme-{n}.zip", "fileSha256": file_hash},
+    }
+
+
+# CatTheFlag
+
+def cattheflag_login() -> str:
+    return '<html><body><form><input type="hidden" name="csrf_token" value="benchmark-token"></form></body></html>'
+
+
+def cattheflag_listing(count: int) -> str:
+    sections = []
+    per_category = max(1, -(-count // len(CATEGORIES)))
+    for c, category in enumerate(CATEGORIES):
+        rows = []
+        for n in range(c * per_category, min(count, (c + 1) * per_category)):
+            rows.append(
+                f"<tr><td>Defi {n}</td><td>{DIFFICULTIES[n % 3]}</td><td>{10 * (n % 20 + 1)}</td>"
+                f'<td><a href="/defis/defi{n}.php">Voir</a></td><td>{n % 100}.5%</td></tr>'
+            )
+        sections.append(
+            f'<div class="challeng__wrap"><h3>{category}</h3><table>'
+            f"<tr><th>Nom</th><th>Difficulté</th><th>Points</th><th>Lien</th><th>Taux</th></tr>"
+            f'{"".join(rows)}</table></div>'
+        )
+    return f'<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>{"".join(sections)}</body></html>'
+
+
+def cattheflag_challenge(n: int, page_filler: int = 50) -> str:
+    return f"""<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>{filler(page_filler)}
+<h1>Defi {n}</h1><p style="color:white">{description(n)}</p>
+<a href="page_membre.php?id={n % 17}">author{n % 17}</a>
+<a href="https://cdn.cattheflag.org/defi{n}.zip">Télécharger</a>{filler(page_filler)}</body></html>"""
+
+
+# ImaginaryCTF
+
+def imaginaryctf_listing(count: int) -> str:
+    parts = []
+    per_category = max(1, -(-count // len(CATEGORIES)))
+    for c, category in enumerate(CATEGORIES):
+        parts.append(f'<h3 class="text-start">{category}</h3>')
+        for n in range(c * per_category, min(count, (c + 1) * per_category)):
+            parts.append(
+                f'<div class="card challenge"><div class="challenge-header">Challenge {n} ({50 + n % 100} pts)</div>'
+                f'<a href="#" data-bs-target="#modal{n}">Open</a></div>'
+            )
+    modals = [
+        f'<div class="modal" id="modal{n}"><h5 class="modal-title">Challenge {n} '
+        f'<small class="text-muted">by author{n % 17}</small><span> - {n % 300} solves</span></h5>'
+        f"<p>{description(n, 1)}</p><b>Attachments</b>"
+        f'<p><a href="https://cybersharing.net/s/container{n}">file</a></p></div>'
+        for n in range(count)
+    ]
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>'
+        f'<div class="container">{"".join(parts)}</div>{"".join(modals)}</body></html>'
+    )
+
+
+def cybersharing_container(container_id: str) -> Dict:
+    return {
+        "id": container_id,
+        "signature": "sig",
+        "uploads": [{"id": f"upload-{container_id}", "fileName": f"{container_id}.zip"}],
+    }
+
+
+# Root-Me
+
+ROOTME_CATEGORIES = ["App-Script", "Cracking", "Cryptanalyse", "Forensic", "Web-Client", "Web-Serveur"]
+ROOTME_PAGE_SIZE = 50
+
+
+def rootme_index(page_filler: int = 50) -> str:
+    links = "".join(
+        f'<a href="fr/Challenges/{category}/"><h4>{category}</h4></a>' for category in ROOTME_CATEGORIES
+    )
+    return f"""<!DOCTYPE html><html><head><meta charset="utf-8"><base href="https://www.root-me.org/"></head>
+<body>{filler(page_filler)}<a href="fr/Challenges/">Challenges</a>{links}{filler(page_filler)}</body></html>"""
+
+
+def rootme_category(category: str, offset: int, count: int, page_filler: int = 50) -> str:
+    """
+    Page of a category listing starting at offset, count challenges being spread
+    over ROOTME_CATEGORIES; challenge numbers are unique across categories
+    """
+    c = ROOTME_CATEGORIES.index(category)
+    per_category = max(1, -(-count // len(ROOTME_CATEGORIES)))
+    first, last = c * per_category, min(count, (c + 1) * per_category)
+    rows = []
+    for n in range(first + offset, min(last, first + offset + ROOTME_PAGE_SIZE)):
+        rows.append(
+            f'<tr><td><img src="squelettes/img/valide.svg"></td>'
+            f'<td class="text-left"><a href="fr/Challenges/{category}/Challenge-{n}">Challenge {n}</a></td>'
+            f'<td>{n * 7 % 90000}</td><td>{5 * (n % 10 + 1)}</td>'
+            f'<td><a class="difficulte1a" title="Très facile : benchmark" href="fr/Challenges/{category}/?difficulte=1">1</a></td>'
+            f'<td><a class="txt_0minirezo" href="/author{n % 17}">author{n % 17}</a></td><td>{n % 5}</td></tr>'
+        )
+    pages = "".join(
+        f'<a class="lien_pagination" href="fr/Challenges/{category}/?debut_challenges_liste={start}'
+        f'#pagination_challenges_liste">{start // ROOTME_PAGE_SIZE + 1}</a>'
+        for start in range(0, max(0, last - first), ROOTME_PAGE_SIZE) if start != offset
+    )
+    return f"""<!DOCTYPE html><html><head><meta charset="utf-8"><base href="https://www.root-me.org/"></head>
+<body>{filler(page_filler)}<table class="countlist"><thead><tr><th></th><th>Nom</th><th>Validations</th>
+<th>Nombre de points</th><th>Difficulté</th><th>Auteur</th><th>Note</th></tr></thead>
+<tbody>{"".join(rows)}</tbody></table><p class="pagination">{pages}</p>{filler(page_filler)}</body></html>"""
+
+
+def rootme_challenge(n: int, page_filler: int = 50) -> str:
+    return f"""<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>{filler(page_filler)}
+<h1 class="challenge-titre-41">Challenge {n}</h1>
+<a class="txt_0minirezo" href="/author{n % 17}">author{n % 17}</a>
+<h2 class="challenge-score-41">{5 * (n % 10 + 1)} Points</h2>
+<div class="challenge-descriptif-41"><p>{description(n)}</p></div>
+<a class="difficulte1a" title="Très facile : benchmark" href="#">1</a>
+<a class="difficulte2" title="Facile : benchmark" href="#">2</a>
+<a class="button small radius" href="https://www.root-me.org/challenges/Cracking/ch{n}.zip">ch{n}.zip</a>
+<a title="Qui a validé ?" href="#">{n * 7 % 90000} Challengeurs</a>
+<span class="notation_valeur">{n % 50} votes</span><span class="left gras">{n % 100}%</span>
+{filler(page_filler)}</body></html>"""
+
+
+# ECSC
+
+def ecsc_challenge(n: int, page_filler: int = 50) -> str:
+    return f"""<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>{filler(page_filler)}
+<h1 class="documentFirstHeading">Challenge {n}</h1>
+<span>Description</span><span>{description(n)}</span>
+<span>Difficulty</span><div class="difficulty"><span>Medium</span></div>
+<span>Provider</span><span>team{n % 17}</span>
+<span>Tags</span><span class="challenge-tags"><span>{CATEGORIES[n % len(CATEGORIES)]}</span></span>
+<span>Event</span><span>ECSC 2024</span>
+<span>Other artefacts</span><ul class="other-artefacts"><li><a href="https://challenges.ecsc.eu/files/ch{n}.zip">ch{n}.zip</a></li></ul>
+<span>Additional Info</span><span>none</span>
+{filler(page_filler)}</body></html>"""
@@ -0,0 +1,82 @@
+"""
+Peak memory of the writeup pipeline as the batch grows, with and without bounded memory
+
+    python -m benchmarks.memory_bench [--platform hackropole] [--batches 25 50 100 200]
+                                      [--max-in-flight 4] [--page-filler 200]
+
+Every run sends a batch of challenge URLs through generate_writeup_pipeline
+against the local stand-in server while tracemalloc is tracing. "default"
+leaves trees to the cycle collector; "bounded" calls enable_bounded_memory.
+The report gives, per mode and batch size, the overall tracemalloc peak and
+the per-stage peaks recorded by the pipeline (traced memory right after an
+item left the stage), which should stay flat as the batch grows.
+"""
+from pathlib import Path
+import contextlib
+import tracemalloc
+import argparse
+import tempfile
+import json
+import sys
+import io
+import gc
+
+from src.generator import WriteupGenerator
+from .standin_server import StandinServer
+from .suite import CHALLENGE_URLS, NEEDS_LISTING, HttpTimer, make_platform
+
+# Platforms whose get_challenge parses through challenge_schema
+SPLIT_PLATFORMS = ["hackropole", "theblackside", "crackmes", "cattheflag", "rootme", "ecsc"]
+
+
+def run(name: str, challenges: int, bounded: bool, max_in_flight: int, base_url: str) -> dict:
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        platform = make_platform(name, base_url, Path(tmp), HttpTimer())
+        if bounded:
+            platform.enable_bounded_memory(max_in_flight)
+        generator = WriteupGenerator(platform, Path(tmp) / "writeups")
+        if name in NEEDS_LISTING:
+            platform.get_challenges()
+        urls = [CHALLENGE_URLS[name](n) for n in range(challenges)]
+        gc.collect()
+        tracemalloc.start()
+        try:
+            written = generator.generate_writeup_pipeline(urls, fetch_workers=max_in_flight)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    if generator.errors:
+        raise Exception(f"{name}: {len(generator.errors)} challenges failed, e.g. {next(iter(generator.errors.values()))}")
+    return {
+        "written": written,
+        "peak_mb": peak / 1e6,
+        "stage_peaks_mb": {stage: size / 1e6 for stage, size in generator.memory_peaks.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--platform", choices=SPLIT_PLATFORMS, default="hackropole")
+    parser.add_argument("--batches", type=int, nargs="+", default=[25, 50, 100, 200])
+    parser.add_argument("--max-in-flight", type=int, default=4)
+    parser.add_argument("--page-filler", type=int, default=200)
+    parser.add_argument("--archive-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    report = {"platform": args.platform, "results": {}}
+    with StandinServer(archive_size=args.archive_size, listing_size=max(args.batches),
+                       page_filler=args.page_filler) as server:
+        # Warm up imports and caches so the first measured run is not inflated
+        run(args.platform, min(args.batches), True, args.max_in_flight, server.base_url)
+        for mode in ("default", "bounded"):
+            report["results"][mode] = {}
+            for challenges in args.batches:
+                result = run(args.platform, challenges, mode == "bounded", args.max_in_flight, server.base_url)
+                report["results"][mode][challenges] = result
+                stages = " ".join(f"{stage}={size:.1f}" for stage, size in result["stage_peaks_mb"].items())
+                print(f"{mode} n={challenges}: peak={result['peak_mb']:.1f}MB {stages}", file=sys.stderr)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
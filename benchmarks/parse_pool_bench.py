@@ -0,0 +1,73 @@
+"""
+Throughput of fetch_many with parsing on threads versus in worker processes
+
+    python -m benchmarks.parse_pool_bench [--platform hackropole] [--challenges 200]
+                                          [--processes 0 2 4] [--page-filler 200]
+
+Pages are served by the local stand-in server with page_filler blocks of
+navigation markup each, so parsing dominates. Every run fetches the same
+challenges on --threads I/O threads; --processes 0 parses on those threads,
+N > 0 parses in N worker processes. The report gives challenges per second,
+the speedup over threads only and whether the challenges are identical.
+Scaling needs as many free cores as processes: the stand-in server itself
+runs in this process.
+"""
+from dataclasses import asdict
+from pathlib import Path
+import contextlib
+import argparse
+import tempfile
+import time
+import json
+import sys
+import io
+import os
+
+from src.generator import WriteupGenerator
+from .standin_server import StandinServer
+from .suite import CHALLENGE_URLS, NEEDS_LISTING, HttpTimer, make_platform
+
+# Platforms whose get_challenge splits into fetch and parse steps
+SPLIT_PLATFORMS = ["hackropole", "theblackside", "crackmes", "cattheflag", "rootme", "ecsc"]
+
+
+def run(name: str, challenges: int, threads: int, processes: int, base_url: str):
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        platform = make_platform(name, base_url, Path(tmp), HttpTimer())
+        generator = WriteupGenerator(platform, Path(tmp))
+        if name in NEEDS_LISTING:
+            platform.get_challenges()
+        urls = [CHALLENGE_URLS[name](n) for n in range(challenges)]
+        start = time.perf_counter()
+        results = generator.fetch_many(urls, max_workers=threads, parse_processes=processes)
+        elapsed = time.perf_counter() - start
+    if generator.errors:
+        raise Exception(f"{name}: {len(generator.errors)} challenges failed, e.g. {next(iter(generator.errors.values()))}")
+    return challenges / elapsed, [asdict(challenge) for challenge in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--platform", choices=SPLIT_PLATFORMS, default="hackropole")
+    parser.add_argument("--challenges", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--processes", type=int, nargs="+", default=[0, 2, 4])
+    parser.add_argument("--page-filler", type=int, default=200)
+    args = parser.parse_args()
+
+    report = {"cpus": os.cpu_count(), "platform": args.platform, "results": {}}
+    with StandinServer(listing_size=args.challenges, page_filler=args.page_filler) as server:
+        baseline = reference = None
+        for processes in args.processes:
+            rate, extracted = run(args.platform, args.challenges, args.threads, processes, server.base_url)
+            baseline = rate if baseline is None else baseline
+            reference = extracted if reference is None else reference
+            result = {"challenges_per_second": rate, "speedup": rate / baseline, "identical": extracted == reference}
+            report["results"][processes] = result
+            print(f"processes={processes}: {rate:.1f} challenges/s x{result['speedup']:.2f}"
+                  f"{'' if result['identical'] else ' (DIFFERS)'}", file=sys.stderr)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Compare HTML tree builders on every platform's get_challenge
+
+    python -m benchmarks.parser_backends [--challenges 50] [--page-filler 50]
+
+Each platform parses the same stand-in pages once per installed backend
+(see src.utils.html_parser), both as whole pages and restricted to the
+platform's challenge_regions. The report gives the parse time per challenge
+(get_challenge time minus HTTP time) and whether the extracted Challenge
+objects are identical to the ones built from whole pages with html.parser.
+"""
+from dataclasses import asdict
+from pathlib import Path
+import contextlib
+import argparse
+import tempfile
+import time
+import json
+import sys
+import io
+import os
+
+from src.generator import WriteupGenerator
+from src.utils.html_parser import available_backends
+from .standin_server import StandinServer
+from .suite import CHALLENGE_URLS, NEEDS_LISTING, HttpTimer, make_platform
+
+# Crackmy answers JSON only, there is no HTML to parse
+HTML_PLATFORMS = ["hackropole", "theblackside", "crackmes", "cattheflag", "imaginaryctf", "rootme", "ecsc"]
+
+
+@contextlib.contextmanager
+def full_parse(enabled: bool):
+    previous = os.environ.get("LETCTF_FULL_PARSE")
+    os.environ["LETCTF_FULL_PARSE"] = "1" if enabled else "0"
+    try:
+        yield
+    finally:
+        if previous is None:
+            del os.environ["LETCTF_FULL_PARSE"]
+        else:
+            os.environ["LETCTF_FULL_PARSE"] = previous
+
+
+def run(name: str, backend: str, challenges: int, base_url: str):
+    timer = HttpTimer()
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        platform = make_platform(name, base_url, Path(tmp), timer)
+        platform.html_parser = backend
+        generator = WriteupGenerator(platform, Path(tmp))
+        if name in NEEDS_LISTING:
+            platform.get_challenges()
+        timer.seconds = 0.0
+        start = time.perf_counter()
+        extracted = [asdict(platform.get_challenge(CHALLENGE_URLS[name](n))) for n in range(challenges)]
+        elapsed = time.perf_counter() - start
+    return (elapsed - timer.seconds) / challenges, extracted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--challenges", type=int, default=50)
+    parser.add_argument("--page-filler", type=int, default=50)
+    parser.add_argument("--platforms", nargs="+", choices=HTML_PLATFORMS, default=HTML_PLATFORMS)
+    args = parser.parse_args()
+
+    backends = available_backends()
+    report = {}
+    with StandinServer(listing_size=args.challenges, page_filler=args.page_filler) as server:
+        for name in args.platforms:
+            results = {}
+            reference = None
+            for backend in reversed(backends):
+                for mode in ("full", "regions"):
+                    with full_parse(mode == "full"):
+                        seconds, extracted = run(name, backend, args.challenges, server.base_url)
+                    reference = extracted if reference is None else reference
+                    results[f"{backend}/{mode}"] = {"ms_per_challenge": seconds * 1000, "identical": extracted == reference}
+            report[name] = results
+            print(name, " ".join(
+                f"{backend}={result['ms_per_challenge']:.2f}ms{'' if result['identical'] else ' (DIFFERS)'}"
+                for backend, result in results.items()
+            ), file=sys.stderr)
+    print(json.dumps({"backends": backends, "results": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Time get_challenge and generate_writeup_structure offline from a fixture archive
+
+Record once against the live site:
+    python -m benchmarks.replay_bench record hackropole fixtures/hackropole.zip URL [URL...]
+Then benchmark without network:
+    python -m benchmarks.replay_bench replay hackropole fixtures/hackropole.zip URL [URL...] [--latency 0.05]
+
+Platforms needing credentials read them from config/<platform>.json as usual.
+"""
+from pathlib import Path
+import argparse
+import tempfile
+import time
+import json
+
+from src.platforms.base import CTFPlatform
+from src.platforms.hackropole import HackropolePlatform
+from src.platforms.theblackside import TheBlackSidePlatform
+from src.platforms.crackmes import CrackmesPlatform
+from src.platforms.crackmy import CrackmyPlatform
+from src.platforms.cattheflag import CatTheFlagPlatform
+from src.platforms.imaginaryctf import ImaginaryCTFPlatform
+from src.platforms.rootme import RootMePlatform
+from src.platforms.ecsc import ECSCPlatform
+from src.generator import WriteupGenerator
+
+PLATFORMS = {
+    "hackropole": lambda: HackropolePlatform(),
+    "theblackside": lambda: TheBlackSidePlatform(cookies_file="./config/theblackside.cookies.json"),
+    "crackmes": lambda: CrackmesPlatform(),
+    "crackmy": lambda: CrackmyPlatform(),
+    "cattheflag": lambda: CatTheFlagPlatform(config_file="./config/catthefile.json"),
+    "imaginaryctf": lambda: ImaginaryCTFPlatform(),
+    "rootme": lambda: RootMePlatform(config_file="./config/rootme.json"),
+    "ecsc": lambda: ECSCPlatform(),
+}
+# Platforms whose get_challenge needs the listing first
+NEEDS_LISTING = ("cattheflag", "imaginaryctf")
+
+
+def run(platform_name: str, urls, output_dir: Path) -> dict:
+    timings = {}
+    start = time.perf_counter()
+    platform = PLATFORMS[platform_name]()
+    timings["init"] = time.perf_counter() - start
+
+    generator = WriteupGenerator(platform, output_dir)
+    if platform_name in NEEDS_LISTING:
+        start = time.perf_counter()
+        platform.get_challenges()
+        timings["listing"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for url in urls:
+        generator.fetch_challenge(challenge_url=url)
+    timings["get_challenge"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    generator.generate_writeup_structure(hugo_header=True, translated=True)
+    timings["generate"] = time.perf_counter() - start
+    timings["challenges_per_second"] = len(urls) / sum(timings.values())
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=("record", "replay"))
+    parser.add_argument("platform", choices=sorted(PLATFORMS))
+    parser.add_argument("archive")
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--latency", default="0", help="seconds per request, or 'recorded'")
+    args = parser.parse_args()
+
+    if args.mode == "record":
+        CTFPlatform.record_archive = args.archive
+    else:
+        CTFPlatform.replay_archive = args.archive
+        CTFPlatform.replay_latency = args.latency if args.latency == "recorded" else float(args.latency)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        timings = run(args.platform, args.urls, Path(tmp))
+    print(json.dumps({"platform": args.platform, "mode": args.mode, **timings}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
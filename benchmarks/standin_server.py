@@ -0,0 +1,154 @@
+"""
+Local HTTP server imitating the eight supported platforms
+
+Requests for https://<host>/<path> are rewritten by StandinAdapter to
+http://127.0.0.1:<port>/<host>/<path>, so the platform modules run unchanged
+against pages from benchmarks.markup.
+"""
+from typing import Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from requests.adapters import HTTPAdapter
+from requests.models import PreparedRequest, Response
+import threading
+import json
+import re
+
+from . import markup
+
+CRACKMES_PASSWORD = "crackmes.one"
+
+
+def _number(path: str) -> int:
+    numbers = re.findall(r"\d+", path)
+    return int(numbers[-1]) if numbers else 0
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle's algorithm the
+    # body waits for the client's delayed ACK (~40 ms per request)
+    disable_nagle_algorithm = True
+    archive_size = 1024 * 1024
+    listing_size = 100
+    page_filler = 50
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, body: bytes, content_type: str = "text/html; charset=utf-8", status: int = 200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _html(self, text: str):
+        self._send(text.encode("utf-8"))
+
+    def _json(self, data):
+        self._send(json.dumps(data).encode("utf-8"), "application/json")
+
+    def _archive(self, host: str):
+        password = CRACKMES_PASSWORD if host == "crackmes.one" else None
+        self._send(markup.archive(self.archive_size, password), "application/zip")
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        host, path = self._split()
+        if host == "crackmy.app" and path == "/api/download/create":
+            file_id = json.loads(body or b"{}").get("fileId", "file-0")
+            return self._json({"url": f"/api/download/{file_id}.zip"})
+        if host == "cybersharing.net" and path.startswith("/api/containers/"):
+            return self._json(markup.cybersharing_container(path.rsplit("/", 1)[-1]))
+        if host == "cattheflag.org" and path == "/connexion.php":
+            return self._html("<html><body>Connecté</body></html>")
+        self._send(b"not found", "text/plain", 404)
+
+    def do_GET(self):
+        host, path = self._split()
+        n = _number(path)
+        size, filler = self.archive_size, self.page_filler
+        if path.endswith(".zip") or path.startswith("/api/download/"):
+            return self._archive(host)
+        if host == "hackropole.fr":
+            return self._html(markup.hackropole_challenge(n, markup.sha256(markup.archive(size)), filler))
+        if host == "theblackside.fr":
+            if path == "/":
+                return self._html(markup.theblackside_home())
+            return self._html(markup.theblackside_challenge(n, filler))
+        if host == "crackmes.one":
+            return self._html(markup.crackmes_challenge(n, filler))
+        if host == "crackmy.app" and path.startswith("/api/crackmes/"):
+            return self._json(markup.crackmy_challenge(n, markup.sha256(markup.archive(size))))
+        if host == "cattheflag.org":
+            if path == "/connexion.php":
+                return self._html(markup.cattheflag_login())
+            if path == "/defis.php":
+                return self._html(markup.cattheflag_listing(self.listing_size))
+            return self._html(markup.cattheflag_challenge(n, filler))
+        if host == "imaginaryctf.org":
+            return self._html(markup.imaginaryctf_listing(self.listing_size))
+        if host == "www.root-me.org":
+            if path == "/fr/Challenges/":
+                return self._html(markup.rootme_index(filler))
+            if path.startswith("/fr/Challenges/") and path.endswith("/"):
+                offset = parse_qs(urlparse(self.path).query).get("debut_challenges_liste", ["0"])[0]
+                category = path.split("/")[-2]
+                return self._html(markup.rootme_category(category, int(offset), self.listing_size, filler))
+            return self._html(markup.rootme_challenge(n, filler))
+        if host == "challenges.ecsc.eu":
+            return self._html(markup.ecsc_challenge(n, filler))
+        self._send(b"not found", "text/plain", 404)
+
+    def _split(self):
+        parts = urlparse(self.path).path.split("/", 2)
+        host = parts[1] if len(parts) > 1 else ""
+        path = "/" + (parts[2] if len(parts) > 2 else "")
+        return host, path
+
+
+class StandinServer:
+    """Threaded stand-in server running in the background"""
+    def __init__(self, archive_size: int = 1024 * 1024, listing_size: int = 100, page_filler: int = 50):
+        handler = type("Handler", (StandinHandler,), {
+            "archive_size": archive_size,
+            "listing_size": listing_size,
+            "page_filler": page_filler,
+        })
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class StandinAdapter(HTTPAdapter):
+    """Rewrite every request to the stand-in server, then send it through adapter"""
+    def __init__(self, base_url: str, adapter: HTTPAdapter):
+        super().__init__()
+        self.base_url = base_url
+        self.local_host = urlparse(base_url).netloc
+        self.adapter = adapter
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        url = urlparse(request.url)
+        if url.netloc != self.local_host:
+            request.url = f"{self.base_url}/{url.netloc}{url.path}" + (f"?{url.query}" if url.query else "")
+        return self.adapter.send(request, **kwargs)
+
+    def close(self):
+        self.adapter.close()
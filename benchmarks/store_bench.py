@@ -0,0 +1,87 @@
+"""
+Time saving and querying a scraped catalog in the SQLite challenge store
+
+    python -m benchmarks.store_bench [--challenges 5000] [--batch-sizes 1 100 1000]
+
+Synthetic challenges (spread over the eight platforms, two files each) are
+saved into a fresh on-disk store once per batch size; batch size 1 is a
+commit per challenge. A second save of the same catalog times the update
+path. The report also times a filtered query ("crypto over 50 points nobody
+solved") and a full-text search, and checks that a round trip through the
+store gives the challenges back unchanged.
+"""
+from dataclasses import asdict
+from pathlib import Path
+import argparse
+import tempfile
+import time
+import json
+import sys
+
+from src.models import Challenge, File
+from src.utils.challenge_store import ChallengeStore
+from . import markup
+from .suite import PLATFORMS
+
+
+def catalog(count: int):
+    return [
+        Challenge(
+            id=f"challenge-{n}",
+            url=f"https://example.org/{PLATFORMS[n % len(PLATFORMS)]}/challenge-{n}",
+            platform=PLATFORMS[n % len(PLATFORMS)],
+            name=f"Challenge {n}",
+            author=f"author{n % 17}",
+            category=markup.CATEGORIES[n % len(markup.CATEGORIES)],
+            description=markup.description(n, 1),
+            files=[File(name=f"ch{n}-{i}.zip", url=f"https://example.org/files/ch{n}-{i}.zip", hash=f"{n:064x}")
+                   for i in range(2)],
+            difficulty=markup.DIFFICULTIES[n % len(markup.DIFFICULTIES)],
+            points=10 * (n % 20 + 1),
+            additional_info={"validation_rate": n % 100},
+            solved_number=n % 7,
+        )
+        for n in range(count)
+    ]
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--challenges", type=int, default=5000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 1000])
+    args = parser.parse_args()
+
+    challenges = catalog(args.challenges)
+    report = {"challenges": args.challenges, "save": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for batch_size in args.batch_sizes:
+            with ChallengeStore(Path(tmp) / f"store-{batch_size}.db") as store:
+                insert_seconds, _ = timed(store.save, challenges, batch_size)
+                update_seconds, _ = timed(store.save, challenges, batch_size)
+            report["save"][batch_size] = {"insert_ms": insert_seconds * 1000, "update_ms": update_seconds * 1000}
+            print(f"batch_size={batch_size}: insert={insert_seconds * 1000:.1f}ms "
+                  f"update={update_seconds * 1000:.1f}ms", file=sys.stderr)
+
+        with ChallengeStore(Path(tmp) / f"store-{args.batch_sizes[-1]}.db") as store:
+            query_seconds, found = timed(store.query, category="crypto", min_points=50, max_solved=0)
+            search_seconds, matches = timed(store.search, "binaire", platform="rootme", limit=20)
+            expected = [asdict(challenge) for challenge in challenges]
+            identical = sorted((asdict(challenge) for challenge in store), key=lambda c: int(c["id"].split("-")[1])) == expected
+        report.update({
+            "query_ms": query_seconds * 1000, "query_results": len(found),
+            "search_ms": search_seconds * 1000, "search_results": len(matches),
+            "round_trip_identical": identical,
+        })
+        print(f"query={query_seconds * 1000:.2f}ms ({len(found)}) search={search_seconds * 1000:.2f}ms "
+              f"({len(matches)}){'' if identical else ' (ROUND TRIP DIFFERS)'}", file=sys.stderr)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
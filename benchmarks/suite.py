@@ -0,0 +1,198 @@
+"""
+End-to-end benchmark of the eight platforms against the local stand-in server
+
+    python -m benchmarks.suite [--challenges 20] [--archive-size 1048576] [--output results.json]
+
+Each platform runs in its own process through the real WriteupGenerator:
+fetch every challenge, then download, render and write the writeups. The
+report holds, per platform, challenges per second, HTML/JSON parse time
+(get_challenge time minus time spent in HTTP), download throughput and peak
+RSS, as JSON so runs can be compared between releases.
+"""
+from pathlib import Path
+import contextlib
+import subprocess
+import argparse
+import platform as host_platform
+import resource
+import tempfile
+import time
+import json
+import sys
+import os
+
+from src.platforms.base import CTFPlatform
+from src.generator import WriteupGenerator
+from .standin_server import StandinServer, StandinAdapter
+
+PLATFORMS = ["hackropole", "theblackside", "crackmes", "crackmy", "cattheflag", "imaginaryctf", "rootme", "ecsc"]
+
+CHALLENGE_URLS = {
+    "hackropole": lambda n: f"https://hackropole.fr/fr/challenges/reverse/challenge-{n}/",
+    "theblackside": lambda n: f"https://theblackside.fr/challenges/web/Challenge{n}",
+    "crackmes": lambda n: f"https://crackmes.one/crackme/{n}",
+    "crackmy": lambda n: f"https://crackmy.app/crackmes/crackme-{n}",
+    "cattheflag": lambda n: f"https://cattheflag.org/defis/defi{n}.php",
+    "imaginaryctf": lambda n: f"challenge-{n}",
+    "rootme": lambda n: f"https://www.root-me.org/fr/Challenges/Cracking/Challenge-{n}",
+    "ecsc": lambda n: f"https://challenges.ecsc.eu/challenges/challenge-{n}",
+}
+NEEDS_LISTING = ("cattheflag", "imaginaryctf")
+
+
+def platform_class(name: str):
+    from src.platforms.hackropole import HackropolePlatform
+    from src.platforms.theblackside import TheBlackSidePlatform
+    from src.platforms.crackmes import CrackmesPlatform
+    from src.platforms.crackmy import CrackmyPlatform
+    from src.platforms.cattheflag import CatTheFlagPlatform
+    from src.platforms.imaginaryctf import ImaginaryCTFPlatform
+    from src.platforms.rootme import RootMePlatform
+    from src.platforms.ecsc import ECSCPlatform
+    return {
+        "hackropole": HackropolePlatform,
+        "theblackside": TheBlackSidePlatform,
+        "crackmes": CrackmesPlatform,
+        "crackmy": CrackmyPlatform,
+        "cattheflag": CatTheFlagPlatform,
+        "imaginaryctf": ImaginaryCTFPlatform,
+        "rootme": RootMePlatform,
+        "ecsc": ECSCPlatform,
+    }[name]
+
+
+class HttpTimer:
+    """Adds up time spent inside the transport"""
+    def __init__(self):
+        self.seconds = 0.0
+
+    def wrap(self, adapter):
+        timer = self
+        send = adapter.send
+
+        def timed_send(request, **kwargs):
+            start = time.perf_counter()
+            try:
+                return send(request, **kwargs)
+            finally:
+                timer.seconds += time.perf_counter() - start
+        adapter.send = timed_send
+        return adapter
+
+
+def make_platform(name: str, base_url: str, workdir: Path, timer: HttpTimer) -> CTFPlatform:
+    cls = platform_class(name)
+
+    class Standin(cls):
+        # Measure the code, not the politeness budget
+        rate_limit = 1e6
+        rate_burst = 1000
+        max_concurrency = 64
+
+        def _create_session(self):
+            session = super()._create_session()
+            for prefix in ("https://", "http://"):
+                session.mount(prefix, timer.wrap(StandinAdapter(base_url, session.get_adapter(prefix))))
+            return session
+
+    credentials = workdir / "credentials.json"
+    credentials.write_text(json.dumps({"email": "bench@example.org", "password": "bench", "session": "bench"}))
+    if name == "theblackside":
+        return Standin(cookies_file=credentials)
+    if name == "cattheflag":
+        return Standin(config_file=credentials)
+    return Standin()
+
+
+def directory_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def run_platform(name: str, challenges: int, base_url: str) -> dict:
+    timer = HttpTimer()
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(open(os.devnull, "w")):
+        workdir = Path(tmp)
+        platform = make_platform(name, base_url, workdir, timer)
+        generator = WriteupGenerator(platform, workdir / "writeups")
+        urls = [CHALLENGE_URLS[name](n) for n in range(challenges)]
+
+        start = time.perf_counter()
+        if name in NEEDS_LISTING:
+            platform.get_challenges()
+        timer.seconds = 0.0
+        fetch_start = time.perf_counter()
+        for url in urls:
+            generator.fetch_challenge(challenge_url=url)
+        fetch_time = time.perf_counter() - fetch_start
+        fetch_http = timer.seconds
+
+        download_time = [0.0]
+        download_challenge_files = platform.download_challenge_files
+
+        def timed_download(challenge, output_dir):
+            download_start = time.perf_counter()
+            try:
+                return download_challenge_files(challenge, output_dir)
+            finally:
+                download_time[0] += time.perf_counter() - download_start
+        platform.download_challenge_files = timed_download
+
+        generator.generate_writeup_structure(hugo_header=True, translated=True)
+        total = time.perf_counter() - start
+        downloaded = directory_size(workdir / "writeups")
+
+    return {
+        "challenges": challenges,
+        "total_seconds": total,
+        "challenges_per_second": challenges / total,
+        "get_challenge_seconds": fetch_time,
+        "parse_seconds": fetch_time - fetch_http,
+        "download_seconds": download_time[0],
+        "download_mb_per_second": downloaded / 1e6 / download_time[0] if download_time[0] else None,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--challenges", type=int, default=20)
+    parser.add_argument("--archive-size", type=int, default=1024 * 1024)
+    parser.add_argument("--page-filler", type=int, default=50, help="boilerplate blocks around each page")
+    parser.add_argument("--platforms", nargs="+", choices=PLATFORMS, default=PLATFORMS)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--worker", nargs=2, metavar=("PLATFORM", "BASE_URL"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_platform(args.worker[0], args.challenges, args.worker[1])))
+        return
+
+    results = {}
+    with StandinServer(args.archive_size, max(args.challenges, 1), args.page_filler) as server:
+        for name in args.platforms:
+            completed = subprocess.run(
+                [sys.executable, "-m", "benchmarks.suite", "--challenges", str(args.challenges),
+                 "--worker", name, server.base_url],
+                capture_output=True, text=True,
+            )
+            if completed.returncode != 0:
+                results[name] = {"error": completed.stderr.strip().splitlines()[-1]}
+            else:
+                results[name] = json.loads(completed.stdout.strip().splitlines()[-1])
+            print(f"{name}: {results[name]}", file=sys.stderr)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "machine": host_platform.machine(),
+        "settings": {"challenges": args.challenges, "archive_size": args.archive_size, "page_filler": args.page_filler},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Compare ZipCrypto extraction with the zipfile module and with src.utils.zipcrypto
+
+Usage: python -m benchmarks.zipcrypto_bench [archive.zip password]
+Without arguments a random password-protected archive is built with the zip
+command line tool.
+"""
+from pathlib import Path
+import subprocess
+import tempfile
+import zipfile
+import hashlib
+import time
+import sys
+import os
+import io
+
+from src.utils import zipcrypto
+
+
+def build_archive(directory: Path, password: str, size: int = 8 * 1024 * 1024) -> Path:
+    payload = directory / "payload"
+    payload.mkdir()
+    (payload / "random.bin").write_bytes(os.urandom(size // 2))
+    (payload / "text.txt").write_bytes(b"crackme " * (size // 16))
+    archive = directory / "bench.zip"
+    subprocess.run(["zip", "-q", "-r", "-P", password, str(archive), "."], cwd=payload, check=True)
+    return archive
+
+
+def extract_stdlib(archive: Path, pwd: bytes):
+    digests = {}
+    with zipfile.ZipFile(archive) as zip_ref:
+        for info in zip_ref.infolist():
+            if not info.is_dir():
+                digests[info.filename] = hashlib.sha256(zip_ref.read(info, pwd=pwd)).hexdigest()
+    return digests
+
+
+def extract_fast(archive: Path, pwd: bytes):
+    digests = {}
+    with zipfile.ZipFile(archive) as zip_ref, open(archive, "rb") as raw:
+        for info in zip_ref.infolist():
+            if not info.is_dir():
+                out = io.BytesIO()
+                zipcrypto.decrypt_member(raw, info, pwd, out)
+                digests[info.filename] = hashlib.sha256(out.getvalue()).hexdigest()
+    return digests
+
+
+def timed(func, *args, repeat: int = 3):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        if len(sys.argv) == 3:
+            archive, password = Path(sys.argv[1]), sys.argv[2]
+        else:
+            password = "crackmes.one"
+            archive = build_archive(Path(tmp), password)
+        pwd = password.encode("utf-8")
+        size = sum(info.file_size for info in zipfile.ZipFile(archive).infolist())
+
+        stdlib_time, stdlib_digests = timed(extract_stdlib, archive, pwd)
+        fast_time, fast_digests = timed(extract_fast, archive, pwd)
+
+    if stdlib_digests != fast_digests:
+        raise SystemExit("Output differs between zipfile and zipcrypto")
+    print(f"archive size (uncompressed): {size / 1e6:.1f} MB")
+    print(f"zipfile:   {stdlib_time:.2f}s  {size / 1e6 / stdlib_time:.2f} MB/s")
+    print(f"zipcrypto: {fast_time:.2f}s  {size / 1e6 / fast_time:.2f} MB/s")
+    print(f"speedup:   {stdlib_time / fast_time:.2f}x, output identical")
+
+
+if __name__ == "__main__":
+    main()
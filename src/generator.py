@@ -1,7 +1,12 @@
 from pathlib import Path
-from typing import List
+from typing import List, Dict, Optional, Iterable, Callable, Set
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import multiprocessing
+import contextlib
 from .platforms.base import CTFPlatform
 from .models import Challenge
+from .utils.pipeline import Pipeline
+from .utils.catalog import Catalog
 
 class WriteupGenerator:
     """Main class to handle writeup generation"""
@@ -9,42 +14,314 @@ class WriteupGenerator:
         self.platform = platform
         self.output_dir = output_dir
         self.challenges = {}
+        self.errors = {}
+        self.memory_peaks = {}
 
-    def fetch_challenges(self):
-        """Fetch all challenges from the platform"""
-        self.challenges = self.platform.get_challenges()
+    def fetch_challenges(self) -> Dict[str, Challenge]:
+        """
+        Fetch the platform's listing, kept in platform.challenges
+
+        Listed challenges may lack description or files, so they are not added
+        to self.challenges: only challenges completed by fetch_challenge or
+        fetch_many get a writeup.
+        """
+        return self.platform.get_challenges()
 
     def fetch_challenge(self, challenge_url: str) -> Challenge:
         """Fetch a specific challenge"""
         self.challenges = [] if not self.challenges else self.challenges
         challenge = self.platform.get_challenge(challenge_url)
         self.challenges.append(challenge)
+        return challenge
+
+    def fetch_many(self, challenge_urls: List[str], max_workers: int = 8,
+                   parse_processes: int = 0) -> List[Optional[Challenge]]:
+        """
+        Fetch several challenges concurrently
+
+        Results keep the order of challenge_urls. A failing URL does not abort the
+        batch: its slot is None and the exception is stored in self.errors[url].
+
+        With parse_processes, pages are still fetched on max_workers threads but
+        parsed in that many worker processes, so parsing is not bound to the one
+        core the GIL allows. Only the raw page goes to a worker and only the
+        Challenge comes back. Platforms whose get_challenge does not split into
+        fetch and parse steps (see CTFPlatform.parse_challenge_page) run as usual.
+        """
+        self.challenges = [] if not self.challenges else self.challenges
+        results: List[Optional[Challenge]] = [None] * len(challenge_urls)
+        errors: Dict[str, Exception] = {}
+
+        with self._parse_pool(parse_processes) as pool, ThreadPoolExecutor(max_workers=max_workers) as executor:
+            get_challenge = self._challenge_getter(pool)
+            futures = [executor.submit(get_challenge, url) for url in challenge_urls]
+            for index, (url, future) in enumerate(zip(challenge_urls, futures)):
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    errors[url] = e
+                    print(f"Error fetching challenge {url}: {e}")
+
+        self.errors.update(errors)
+        self.challenges.extend(challenge for challenge in results if challenge is not None)
+        return results
+
+    @staticmethod
+    def _parse_pool(processes: int):
+        if not processes:
+            return contextlib.nullcontext(None)
+        # Workers start from a fresh interpreter: forking a process that runs
+        # fetch threads could copy locks held by those threads
+        return ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+
+    def _parse_in_pool(self, pool: ProcessPoolExecutor, challenge_url: str, content: bytes) -> Challenge:
+        parsed = pool.submit(
+            self.platform.page_parser_class().parse_challenge_page,
+            challenge_url, content, self.platform.html_parser, self.platform.release_trees,
+        ).result()
+        return self.platform.finish_challenge(parsed)
+
+    def _challenge_getter(self, pool: Optional[ProcessPoolExecutor]) -> Callable[[str], Challenge]:
+        """get_challenge, with its parse step sent to pool when there is one and the platform allows it"""
+        if pool is None or not self.platform.page_parser_class():
+            return self.platform.get_challenge
+
+        def get_challenge(challenge_url: str) -> Challenge:
+            with self.platform.page_slot():
+                return self._parse_in_pool(pool, challenge_url, self.platform.fetch_challenge_page(challenge_url))
+
+        return get_challenge
 
     def generate_writeup_structure(self, hugo_header: bool = False, translated: bool = False):
         """Generate folder structure and writeup templates"""
-        for challenge in self.challenges:
-            platform_dir = self.output_dir / challenge.platform.lower()
-            platform_dir.mkdir(parents=True, exist_ok=True)
-
-            challenge_dir = platform_dir / self._sanitize_filename(challenge.id)
-            if challenge_dir.exists():
-                print(f"Challenge directory for {challenge.id} already exists. Skipping...")
+        for challenge in self._iter_loaded_challenges():
+            challenge_dir = self._prepare_challenge_dir(challenge)
+            if challenge_dir is None:
                 continue
+            self._download_files(challenge, challenge_dir)
+            self.platform.generate_template(challenge, hugo_header, translated)
+            self._write_writeup(challenge, challenge_dir, translated)
+
+    def generate_writeup_pipeline(
+        self,
+        challenge_urls: Optional[Iterable[str]] = None,
+        hugo_header: bool = False,
+        translated: bool = False,
+        fetch_workers: int = 4,
+        download_workers: int = 4,
+        render_workers: int = 1,
+        write_workers: int = 1,
+        queue_size: int = 8,
+        parse_processes: int = 0,
+        stream: bool = False,
+    ) -> int:
+        """
+        Generate writeups with fetch, download, render and write running as overlapping stages
+
+        When challenge_urls is given, challenges are fetched inside the pipeline and
+        are not kept in self.challenges, so memory stays bounded by the queue sizes.
+        Otherwise the already loaded challenges are used. Failures are recorded per
+        item in self.errors instead of aborting the run. When tracemalloc is
+        tracing, the peak traced memory per stage ends up in self.memory_peaks.
+
+        With parse_processes, fetching is split into a fetch stage on threads and
+        a parse stage backed by that many worker processes, as in fetch_many.
+
+        With stream, challenges come from platform.iter_challenges() as the
+        listing is parsed, and the fetch stage completes each one
+        (platform.complete_challenge): the first writeups are written while the
+        listing is still being crawled, and nothing is kept in self.challenges.
+
+        Returns:
+            int: Number of writeups written
+        """
+        pipeline = Pipeline(queue_size=queue_size)
+        if stream:
+            items = self.platform.iter_challenges()
+            parse_processes = 0
+        elif challenge_urls is None:
+            items = self._iter_loaded_challenges()
+            parse_processes = 0
+        else:
+            items = challenge_urls
+            if not self.platform.page_parser_class():
+                parse_processes = 0
 
-            challenge_dir.mkdir(exist_ok=True)
+        # With bounded memory a page holds its slot from fetch until parsed
+        slots = self.platform.page_slots
 
-            files_dir = challenge_dir / "files"
-            files_dir.mkdir(exist_ok=True)
-            self.platform.download_challenge_files(challenge, files_dir)
+        def fetch(challenge_url: str):
+            if slots is not None:
+                slots.acquire()
+            try:
+                return challenge_url, self.platform.fetch_challenge_page(challenge_url)
+            except BaseException:
+                if slots is not None:
+                    slots.release()
+                raise
 
+        def parse(page):
+            try:
+                return self._parse_in_pool(pool, *page)
+            finally:
+                if slots is not None:
+                    slots.release()
+
+        def download(challenge: Challenge):
+            challenge_dir = self._prepare_challenge_dir(challenge)
+            if challenge_dir is None:
+                return None
+            self._download_files(challenge, challenge_dir)
+            return challenge, challenge_dir
+
+        def render(job):
+            challenge, _ = job
             self.platform.generate_template(challenge, hugo_header, translated)
+            return job
+
+        def write(job):
+            challenge, challenge_dir = job
+            self._write_writeup(challenge, challenge_dir, translated)
+            return job
+
+        if parse_processes:
+            pipeline.add_stage("fetch", fetch, fetch_workers)
+            pipeline.add_stage("parse", parse, parse_processes)
+        elif stream:
+            pipeline.add_stage("fetch", self.platform.complete_challenge, fetch_workers)
+        elif challenge_urls is not None:
+            pipeline.add_stage("fetch", self.platform.get_challenge, fetch_workers)
+        pipeline.add_stage("download", download, download_workers)
+        pipeline.add_stage("render", render, render_workers)
+        pipeline.add_stage("write", write, write_workers)
+        with self._parse_pool(parse_processes) as pool:
+            written = pipeline.run(items)
+        self.memory_peaks = pipeline.memory_peaks
+
+        for stage, item, error in pipeline.errors:
+            if isinstance(item, tuple):
+                item = item[0]
+            self.errors[item if isinstance(item, str) else self.platform.challenge_key(item)] = error
+        return written
+
+    def sync(
+        self,
+        catalog: Catalog,
+        hugo_header: bool = False,
+        translated: bool = False,
+        fetch_workers: int = 4,
+        download_workers: int = 4,
+        queue_size: int = 8,
+    ) -> Dict[str, List[str]]:
+        """
+        Fetch and download only the challenges that are new or changed since the last sync
+
+        The platform listing (iter_challenges) is compared with catalog as it
+        streams in: challenges whose listing fingerprint is unchanged are
+        skipped, the others go through get_challenge (complete_challenge) and
+        download_challenge_files. Existing writeups are never overwritten, only
+        missing ones are generated. Catalog entries no longer listed are removed;
+        their directories are kept. Failed challenges are left out of the
+        catalog so the next sync retries them.
+
+        Args:
+            catalog (Catalog): Challenges seen by previous syncs, saved on return
+
+        Returns:
+            Dict[str, List[str]]: Challenge ids under "added", "changed", "removed",
+                "unchanged" and "failed"
+        """
+        report = {"added": [], "changed": [], "removed": [], "unchanged": [], "failed": []}
+        listed: Dict[str, Set[str]] = {}
+
+        def changed_challenges():
+            for challenge in self.platform.iter_challenges():
+                listed.setdefault(challenge.platform, set()).add(challenge.id)
+                challenge_fingerprint = catalog.fingerprint(challenge)
+                entry = catalog.get(challenge.platform, challenge.id)
+                if entry is not None and entry["fingerprint"] == challenge_fingerprint:
+                    catalog.mark_listed(challenge)
+                    report["unchanged"].append(challenge.id)
+                    continue
+                yield challenge, challenge_fingerprint, "added" if entry is None else "changed"
+
+        # The listed challenge travels with each job: the catalog, the report and
+        # removal all use its id, which the complete page may spell differently
+        def fetch(job):
+            listed_challenge, challenge_fingerprint, status = job
+            challenge = self.platform.complete_challenge(listed_challenge)
+            return listed_challenge, challenge, challenge_fingerprint, status
+
+        def download(job):
+            listed_challenge, challenge, challenge_fingerprint, status = job
+            challenge_dir = self._challenge_path(challenge)
+            challenge_dir.mkdir(parents=True, exist_ok=True)
+            self._download_files(challenge, challenge_dir)
+            return listed_challenge, challenge, challenge_fingerprint, status, challenge_dir
+
+        def write(job):
+            listed_challenge, challenge, challenge_fingerprint, status, challenge_dir = job
+            if not (challenge_dir / "index.md").exists():
+                self.platform.generate_template(challenge, hugo_header, translated)
+                self._write_writeup(challenge, challenge_dir, translated)
+            catalog.record(listed_challenge, challenge_fingerprint)
+            # Only counted once done, so a failed challenge is only under "failed"
+            report[status].append(listed_challenge.id)
+            return job
+
+        pipeline = Pipeline(queue_size=queue_size)
+        pipeline.add_stage("fetch", fetch, fetch_workers)
+        pipeline.add_stage("download", download, download_workers)
+        pipeline.add_stage("write", write)
+        try:
+            pipeline.run(changed_challenges())
+            for platform, challenge_ids in listed.items():
+                removed = catalog.ids(platform) - challenge_ids
+                catalog.remove(platform, removed)
+                report["removed"].extend(sorted(removed))
+        finally:
+            catalog.save()
+
+        for stage, job, error in pipeline.errors:
+            report["failed"].append(job[0].id)
+            self.errors[self.platform.challenge_key(job[0])] = error
+        print(f"Sync: {len(report['added'])} added, {len(report['changed'])} changed, "
+              f"{len(report['removed'])} removed, {len(report['unchanged'])} unchanged, "
+              f"{len(report['failed'])} failed")
+        return report
+
+    def _iter_loaded_challenges(self) -> Iterable[Challenge]:
+        return self.challenges or []
+
+    def _prepare_challenge_dir(self, challenge: Challenge) -> Optional[Path]:
+        """
+        Create the challenge directory, or return None if its writeup already exists
+
+        index.md is written last, so a directory without it comes from an
+        interrupted run and is reused to resume its downloads.
+        """
+        challenge_dir = self._challenge_path(challenge)
+        if (challenge_dir / "index.md").exists():
+            print(f"Challenge directory for {challenge.id} already exists. Skipping...")
+            return None
+
+        challenge_dir.mkdir(parents=True, exist_ok=True)
+        return challenge_dir
+
+    def _challenge_path(self, challenge: Challenge) -> Path:
+        return self.output_dir / challenge.platform.lower() / self._sanitize_filename(challenge.id)
 
-            (challenge_dir / "index.md").write_text(challenge.template)
+    def _download_files(self, challenge: Challenge, challenge_dir: Path):
+        files_dir = challenge_dir / "files"
+        files_dir.mkdir(exist_ok=True)
+        self.platform.download_challenge_files(challenge, files_dir)
 
-            if translated:
-                (challenge_dir / "index.fr.md").write_text(challenge.template_translated)
-            print(f"Writeup for {challenge.id} has been generated in {challenge_dir}")
+    def _write_writeup(self, challenge: Challenge, challenge_dir: Path, translated: bool):
+        (challenge_dir / "index.md").write_text(challenge.template)
 
+        if translated:
+            (challenge_dir / "index.fr.md").write_text(challenge.template_translated)
+        print(f"Writeup for {challenge.id} has been generated in {challenge_dir}")
 
     @staticmethod
     def _sanitize_filename(filename: str) -> str:
@@ -1,29 +1,241 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Callable, Iterator
 import requests
+from requests.adapters import HTTPAdapter
 from http.cookiejar import CookieJar
 from pathlib import Path
+import contextlib
+import threading
 from ..models import Challenge
+from ..utils.http_cache import ResponseCache, CachingAdapter
+from ..utils.blob_store import BlobStore
+from ..utils.rate_limiter import HostRateLimiter, RateLimitAdapter
+from ..utils.resilience import ResilientAdapter
+from ..utils.hedging import HedgingAdapter, HedgeStats
+from ..utils.fixtures import FixtureWriter, RecordingAdapter, ReplayAdapter
+from ..utils.html_parser import Regions, parse_html, release_tree
+from ..utils.extraction import Schema
 
 class CTFPlatform(ABC):
     """Abstract base class for CTF platforms"""
+    # Per-host request budget, override in subclasses for stricter sites
+    rate_limit: float = 5.0
+    rate_burst: int = 5
+    max_concurrency: int = 8
+    # (connect, read) timeouts in seconds and retries of idempotent requests
+    timeout: tuple = (10.0, 30.0)
+    max_retries: int = 3
+    # HTML tree builder for parse_html, None picks the fastest installed
+    html_parser: Optional[str] = None
+    # Subtrees get_challenge reads (utils.html_parser.Regions), None parses whole pages
+    challenge_regions: Optional[Regions] = None
+    # Fields get_challenge reads (utils.extraction.Schema), compiled once per class
+    challenge_schema: Optional[Schema] = None
+    # Fixture archives applied by __init__, before any subclass logs in
+    record_archive: Optional[str | Path] = None
+    replay_archive: Optional[str | Path] = None
+    replay_latency: float | str = 0.0
+
     def __init__(self, url: str, cookies: Optional[CookieJar] = None):
         self.base_url = url
-        self.session = requests.Session()
+        self.session = self._create_session()
         if cookies:
             self.session.cookies = cookies
+        self.blob_store: Optional[BlobStore] = None
+        self.download_segments = 1
+        self.hedge_stats: Dict[str, HedgeStats] = {}
+        # Challenges listed so far, for platforms whose get_challenge completes them
+        self.challenges: Dict[str, Challenge] = {}
+        self.release_trees = False
+        self.page_slots: Optional[threading.BoundedSemaphore] = None
+        self.rate_limiter = HostRateLimiter(self.rate_limit, self.rate_burst, self.max_concurrency)
+        self._wrap_adapters(lambda adapter: RateLimitAdapter(self.rate_limiter, adapter))
+        # Outside the rate limiter, so every retry also waits for its token
+        self._wrap_adapters(lambda adapter: ResilientAdapter(adapter, timeout=self.timeout, retries=self.max_retries))
+        if self.replay_archive:
+            self.enable_replay(self.replay_archive, self.replay_latency)
+        elif self.record_archive:
+            self.enable_recording(self.record_archive)
+
+    def _create_session(self) -> requests.Session:
+        """Build the bare session, before rate limiting and retries are layered on it"""
+        return requests.Session()
+
+    def _wrap_adapters(self, wrap: Callable[[HTTPAdapter], HTTPAdapter]):
+        """Mount wrap(current adapter) for both http and https on the session"""
+        for prefix in ("https://", "http://"):
+            self.session.mount(prefix, wrap(self.session.get_adapter(prefix)))
+
+    def configure_rate_limit(self, rate: float, burst: int = 1, max_concurrency: Optional[int] = None):
+        """
+        Change the per-host request budget
+
+        Args:
+            rate (float): Requests per second allowed per host on average
+            burst (int): Requests allowed back to back before the rate applies
+            max_concurrency (int, optional): Upper bound of the adaptive in-flight limit
+        """
+        self.rate_limiter.rate = rate
+        self.rate_limiter.burst = burst
+        if max_concurrency:
+            self.rate_limiter.max_concurrency = max_concurrency
+        # Existing hosts pick up the new budget on their next request
+        self.rate_limiter.buckets.clear()
+        self.rate_limiter.concurrency.clear()
+
+    def enable_cache(self, cache_dir: str | Path, ttl: float = 24 * 3600, max_size: int = 512 * 1024 * 1024):
+        """
+        Cache GET responses of the session on disk
+
+        Args:
+            cache_dir (str | Path): Directory holding cached responses, shared across runs
+            ttl (float): Seconds during which an entry is served without revalidation
+            max_size (int): Maximum total size of cached bodies in bytes, evicted LRU
+        """
+        cache = ResponseCache(cache_dir, max_size=max_size)
+        self._wrap_adapters(lambda adapter: CachingAdapter(cache, adapter, ttl=ttl))
+
+    def enable_hedging(self, percentile: float = 95, min_samples: int = 20, default_delay: float = 2.0):
+        """
+        Send a second copy of GET requests slower than the host's latency percentile
+
+        The first answer wins. Per-host counters (requests, hedged, hedge_wins)
+        are kept in self.hedge_stats.
+        """
+        self._wrap_adapters(
+            lambda adapter: HedgingAdapter(adapter, percentile, min_samples, default_delay, stats=self.hedge_stats)
+        )
+
+    def enable_recording(self, archive_path: str | Path):
+        """Save every request and response of the session into a fixture archive"""
+        writer = FixtureWriter(archive_path)
+        self._wrap_adapters(lambda adapter: RecordingAdapter(writer, adapter))
+
+    def enable_replay(self, archive_path: str | Path, latency: float | str = 0.0):
+        """
+        Serve every request from a fixture archive instead of the network
+
+        Replay replaces the whole transport stack (rate limiting, retries, cache),
+        so runs are deterministic and only cost the optional simulated latency.
+        """
+        replay = ReplayAdapter(archive_path, latency)
+        for prefix in ("https://", "http://"):
+            self.session.mount(prefix, replay)
+
+    def enable_blob_store(self, store_dir: str | Path):
+        """
+        Keep downloaded files in a content-addressed store shared across challenges and runs
+
+        Files whose expected SHA-256 is already in the store are linked into place
+        without any network transfer.
+        """
+        self.blob_store = BlobStore(store_dir)
+
+    def enable_segmented_downloads(self, segments: int = 4):
+        """
+        Download large files as several byte ranges fetched in parallel
+
+        Ranges share the session's connection pool, which keeps 10 connections
+        per host by default.
+        """
+        self.download_segments = segments
+
+    def enable_bounded_memory(self, max_in_flight: int = 4):
+        """
+        Keep memory flat however many challenges a batch fetches
+
+        Parse trees are freed as soon as the fields are extracted, instead of
+        waiting for the cycle collector, and at most max_in_flight pages are
+        held between the start of their fetch and the end of their parsing:
+        further fetches block until a slot frees up.
+        """
+        self.release_trees = True
+        self.page_slots = threading.BoundedSemaphore(max_in_flight)
+
+    def page_slot(self):
+        """Context manager holding one in-flight page slot, if bounded memory is enabled"""
+        return self.page_slots if self.page_slots is not None else contextlib.nullcontext()
 
     @abstractmethod
     def login(self, credentials: Dict) -> bool:
         pass
 
-    @abstractmethod
-    def get_challenges(self) -> List[Challenge]:
-        pass
+    def iter_challenges(self) -> Iterator[Challenge]:
+        """
+        Yield the challenges of the platform's listing as they are parsed
+
+        Listings may leave fields out (description, files...);
+        complete_challenge fills them in.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support listing its challenges")
+
+    def get_challenges(self) -> Dict[str, Challenge]:
+        """Get all challenges from platform, keyed by challenge_key"""
+        self.challenges = {self.challenge_key(challenge): challenge for challenge in self.iter_challenges()}
+        return self.challenges
+
+    def challenge_key(self, challenge: Challenge) -> str:
+        """Key identifying a challenge in self.challenges and in get_challenge, its URL by default"""
+        return challenge.url
+
+    def complete_challenge(self, challenge: Challenge) -> Challenge:
+        """Fetch what the listing left out of a challenge, by default its whole page"""
+        return self.get_challenge(challenge.url)
 
-    @abstractmethod
     def get_challenge(self, challenge_url: str) -> Challenge:
-        pass
+        """Get a specific challenge by URL"""
+        with self.page_slot():
+            content = self.fetch_challenge_page(challenge_url)
+            parsed = self.parse_challenge_page(challenge_url, content, self.html_parser, self.release_trees)
+        return self.finish_challenge(parsed)
+
+    def fetch_challenge_page(self, challenge_url: str) -> bytes:
+        """Fetch the raw page parse_challenge_page reads"""
+        try:
+            response = self.session.get(challenge_url, headers=getattr(self, "headers", None))
+            if response.status_code != 200:
+                raise Exception(
+                    f"Error fetching challenge {challenge_url}: {response.status_code}"
+                )
+        except requests.RequestException as e:
+            raise Exception(f"Error fetching challenge {challenge_url}: {e}")
+        return response.content
+
+    @classmethod
+    def extract_challenge_page(cls, content: bytes, html_parser: Optional[str] = None,
+                               release: bool = False) -> Dict:
+        """Parse challenge_regions of a page and extract challenge_schema, optionally freeing the tree"""
+        soup = parse_html(content, html_parser, regions=cls.challenge_regions)
+        try:
+            return cls.challenge_schema.extract(soup)
+        finally:
+            if release:
+                release_tree(soup)
+
+    @classmethod
+    def parse_challenge_page(cls, challenge_url: str, content: bytes, html_parser: Optional[str] = None,
+                             release_tree: bool = False) -> Challenge:
+        """
+        Build a Challenge from a fetched page without any I/O
+
+        This may run in a worker process (see WriteupGenerator.fetch_many), so it
+        only reads its arguments and class attributes, and returns plain data.
+        Platforms whose get_challenge cannot be split this way override
+        get_challenge instead.
+        """
+        raise NotImplementedError(f"{cls.__name__} does not parse challenge pages on their own")
+
+    def finish_challenge(self, challenge: Challenge) -> Challenge:
+        """Complete a parsed challenge with instance state, in the calling process"""
+        return challenge
+
+    @classmethod
+    def page_parser_class(cls) -> Optional[type]:
+        """Importable class defining parse_challenge_page, None if get_challenge is not split"""
+        for klass in cls.__mro__:
+            if "parse_challenge_page" in vars(klass):
+                return None if klass is CTFPlatform else klass
+        return None
 
     @abstractmethod
     def download_challenge_files(self, challenge: Challenge, destination: Path) -> List[Path]:
@@ -31,4 +243,4 @@ class CTFPlatform(ABC):
 
     @abstractmethod
     def generate_template(self, challenge: Challenge, hugo_header: bool, translated: bool) -> str:
-        pass
\ No newline at end of file
+        pass
@@ -1,16 +1,35 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Iterator
 from pathlib import Path
 from .base import CTFPlatform
 from ..models import Challenge, File
 from ..utils.config_handler import load_config
 from ..utils.challenge_handler import download_files
-from bs4 import BeautifulSoup
+from ..utils.html_parser import parse_html, Regions
+from ..utils.extraction import Schema, Field, attribute, element
 from datetime import datetime
 import textwrap
 import requests
 import re
 
 class CatTheFlagPlatform(CTFPlatform):
+    challenge_regions = Regions("h1", "p[style=color:white]", "a[href*=page_membre.php]", "a[href*=cdn.cattheflag.org]")
+    listing_regions = Regions("div.challeng__wrap")
+    challenge_schema = Schema(
+        title=Field("h1"),
+        description=Field("p[style=color:white]"),
+        author_name=Field("a[href*=page_membre.php]", optional=True),
+        file_url=Field("a[href*=cdn.cattheflag.org]", get=attribute("href"), optional=True),
+    )
+    # One record per table row, the first row holding the column names
+    listing_schema = Schema(
+        sections=Field("div.challeng__wrap", many=True, schema=Schema(
+            category=Field("h3"),
+            rows=Field("tr", many=True, schema=Schema(
+                cells=Field("th, td", many=True, get=element),
+            )),
+        )),
+    )
+
     def __init__(self, url: str = "https://cattheflag.org", config_file: str | Path = None):
         super().__init__(url)
         self.url = url
@@ -43,7 +62,7 @@ class CatTheFlagPlatform(CTFPlatform):
     def get_csrf_token(self) -> str:
         try:
             response = self.session.get('https://cattheflag.org/connexion.php', headers=self.headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = parse_html(response.content, self.html_parser)
             csrf_token = soup.find('input', {'name': 'csrf_token'})['value']
             return csrf_token
         except requests.RequestException:
@@ -69,8 +88,8 @@ class CatTheFlagPlatform(CTFPlatform):
             return True
 
 
-    def get_challenges(self) -> List[Challenge]:
-        """Get all challenges from platform"""
+    def iter_challenges(self) -> Iterator[Challenge]:
+        """Yield the challenges of the listing, without description, author or files"""
         try:
             response = self.session.get('https://cattheflag.org/defis.php', headers=self.headers)
             if response.status_code != 200:
@@ -78,21 +97,15 @@ class CatTheFlagPlatform(CTFPlatform):
         except requests.RequestException as e:
             raise Exception(f"Error fetching challenges: {e}")
         
-        response.encoding = "utf-8"
-        soup = BeautifulSoup(response.text, 'html.parser')
-        challenges = {}
-        
-        challenge_sections = soup.find_all('div', class_='challeng__wrap')
-        
-        for section in challenge_sections:
-            category = section.find('h3').text.strip()
+        soup = parse_html(response.content, self.html_parser, regions=self.listing_regions)
+        sections = self.listing_schema.extract(soup)["sections"]
+
+        for section in sections:
+            category = section["category"]
             if category != 'Histoire':
-                table = section.find('table')
-                rows = table.find_all('tr')[1:]
-                
-                for row in rows:
-                    cols = row.find_all(['th', 'td'])
-                    
+                for row in section["rows"][1:]:
+                    cols = row["cells"]
+
                     link = cols[3].find('a')
                     url = link['href'] if link else None
                 
@@ -100,7 +113,7 @@ class CatTheFlagPlatform(CTFPlatform):
                     challenge_id = url.split('/')[-1].replace('.php', '') if url else re.sub(r'[^a-zA-Z0-9]', '-', challenge_name.lower())
 
                     challenge_url = self.base_url + url
-                    challenges[challenge_url] = Challenge(
+                    challenge = Challenge(
                         id=challenge_id,
                         url=challenge_url,
                         platform="CatTheFlag",
@@ -113,43 +126,46 @@ class CatTheFlagPlatform(CTFPlatform):
                         files=None,
                         additional_info={'validation_rate': float(cols[4].text.strip().replace('%', ''))}
                     )
-        self.challenges = challenges
+                    # finish_challenge completes the listed challenge in place
+                    self.challenges[self.challenge_key(challenge)] = challenge
+                    yield challenge
     
-    def get_challenge(self, challenge_url: str) -> Challenge:
-        """Get a specific challenge by URL"""
-        try:
-            response = self.session.get(challenge_url, headers=self.headers)
-            if response.status_code != 200:
-                raise Exception(
-                    f"Error fetching challenge {challenge_url}: {response.status_code}"
-                )
-        except requests.RequestException as e:
-            raise Exception(f"Error fetching challenge {challenge_url}: {e}")
-        
-        response.encoding = "utf-8"  # Force UTF-8 encoding
-        soup = BeautifulSoup(response.text, "html.parser")
+    @classmethod
+    def parse_challenge_page(cls, challenge_url: str, content: bytes, html_parser: Optional[str] = None,
+                             release_tree: bool = False) -> Challenge:
+        """Build the challenge from its fetched page"""
+        fields = cls.extract_challenge_page(content, html_parser, release_tree)
 
-        title = soup.find('h1').text.strip()
-    
-        description = soup.find('p', style='color:white').text.strip()
-        
-        author_link = soup.find('a', href=lambda x: x and 'page_membre.php' in x)
-        author_name = author_link.text.strip() if author_link else None
-        
-        file_link = soup.find('a', href=lambda x: x and 'cdn.cattheflag.org' in x)
-        if file_link:
+        title = fields["title"]
+        description = fields["description"]
+        author_name = fields["author_name"]
+
+        if fields["file_url"]:
             files = [File(
-                name=file_link['href'].split('/')[-1],
-                url=file_link['href'],
+                name=fields["file_url"].split('/')[-1],
+                url=fields["file_url"],
                 hash=None
             )]
         else:
             files = []
 
-        challenge = self.challenges.get(challenge_url)
-        challenge.description = description
-        challenge.author = author_name
-        challenge.files = files
+        # Only the page fields, the rest comes from the listing in finish_challenge
+        return Challenge(
+            id=None,
+            url=challenge_url,
+            platform="CatTheFlag",
+            name=title,
+            author=author_name,
+            category=None,
+            description=description,
+            files=files,
+        )
+
+    def finish_challenge(self, parsed: Challenge) -> Challenge:
+        challenge = self.challenges.get(parsed.url)
+        challenge.description = parsed.description
+        challenge.author = parsed.author
+        challenge.files = parsed.files
         return challenge
 
     def download_challenge_files(self, challenge: Challenge, output_dir: Path):
@@ -1,15 +1,34 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from pathlib import Path
-import requests
 from .base import CTFPlatform
 from ..models import Challenge, File
 from ..utils.challenge_handler import download_files
-from bs4 import BeautifulSoup
+from ..utils.html_parser import Regions
+from ..utils.extraction import Schema, Field, attribute
 from datetime import datetime
 import textwrap
-import re
+
+
+def _get_text_after_br(element):
+    br = element.find('br')
+    if br and br.next_sibling:
+        return br.next_sibling.strip()
+    return None
+
 
 class CrackmesPlatform(CTFPlatform):
+    challenge_regions = Regions("div.container.grid-lg.wrapper", "a.btn-download")
+    challenge_schema = Schema(
+        author_name=Field("div.container.grid-lg.wrapper a[href*=/user/]", get=lambda link: link.text, optional=True),
+        title=Field("div.container.grid-lg.wrapper h3", optional=True),
+        description=Field("div.container.grid-lg.wrapper span[style=white-space: pre-line]", optional=True),
+        download_link=Field("a.btn-download", get=attribute("href"), optional=True),
+        columns=Field("div.container.grid-lg.wrapper div.column", many=True, schema=Schema(
+            # (label, value) of a "Label:<br>value" paragraph
+            p=Field("p", get=lambda p: (p.text.strip(), _get_text_after_br(p)), optional=True),
+        )),
+    )
+
     def __init__(self, url: str = "https://crackmes.one"):
         super().__init__(url)
         self.headers = {}
@@ -18,58 +37,27 @@ class CrackmesPlatform(CTFPlatform):
         """Not implementing login since we don't need it :D"""
         return True
     
-    def get_challenges(self) -> List[Challenge]:
-        raise NotImplementedError("Method not implemented")
-    
-    def get_challenge(self, challenge_url: str) -> Challenge:
-        """Get a specific challenge by URL"""
-        try:
-            response = self.session.get(challenge_url, headers=self.headers)
-            if response.status_code != 200:
-                raise Exception(
-                    f"Error fetching challenge {challenge_url}: {response.status_code}"
-                )
-        except requests.RequestException as e:
-            raise Exception(f"Error fetching challenge {challenge_url}: {e}")
-        
-        response.encoding = "utf-8"  # Force UTF-8 encoding
-        soup = BeautifulSoup(response.text, "html.parser")
+    @classmethod
+    def parse_challenge_page(cls, challenge_url: str, content: bytes, html_parser: Optional[str] = None,
+                             release_tree: bool = False) -> Challenge:
+        """Build the challenge from its fetched page"""
+        fields = cls.extract_challenge_page(content, html_parser, release_tree)
 
-        container = soup.find('div', class_='container grid-lg wrapper')
+        author_name = fields["author_name"]
+        title = fields["title"]
+        name = title.replace("{author_name}'s ".format(author_name=author_name), "") if title else None
 
-        download_link = soup.find('a', class_='btn-download')
+        id = f"{name}-{author_name}"
 
-        author_element = container.find('a', href=re.compile(r'/user/'))
-        author_name = author_element.text if author_element else None
-        
-        title_element = container.find('h3')
-        name = title_element.text.strip().replace("{author_name}'s ".format(author_name=author_name), "") if title_element else None
+        description = fields["description"]
 
-        id = f"{name}-{author_name}"
-        
-        
-        description_element = container.find('span', style='white-space: pre-line')
-        description = description_element.text.strip() if description_element else None
-        
-        difficulty_element = container.find('p', text=re.compile('Difficulty:'))
-        difficulty = float(difficulty_element.text.replace('Difficulty:', '').strip()) if difficulty_element else None
-        
-        if download_link:
-            file = File(
-                name = download_link['href'].split('/')[-1],
-                url = "https://crackmes.one" + download_link['href'],
+        files = []
+        if fields["download_link"]:
+            files.append(File(
+                name = fields["download_link"].split('/')[-1],
+                url = "https://crackmes.one" + fields["download_link"],
                 hash=None,
-            )
-        
-        columns = container.find_all('div', class_='column')
-        
-        def get_text_after_br(element):
-            if not element:
-                return None
-            br = element.find('br')
-            if br and br.next_sibling:
-                return br.next_sibling.strip()
-            return None
+            ))
         
         platform = None
         language = None
@@ -77,30 +65,27 @@ class CrackmesPlatform(CTFPlatform):
         quality = None
         difficulty = None
         
-        for column in columns:
-            p_tag = column.find('p')
-            if not p_tag:
+        for column in fields["columns"]:
+            if not column["p"]:
                 continue
-                
-            text = p_tag.text.strip()
+
+            text, value = column["p"]
             if text.startswith('Language:'):
-                language = get_text_after_br(p_tag)
+                language = value
             elif text.startswith('Platform'):
-                platform = get_text_after_br(p_tag)
+                platform = value
             elif text.startswith('Arch:'):
-                architecture = get_text_after_br(p_tag)
+                architecture = value
             elif text.startswith('Quality:'):
-                quality_text = get_text_after_br(p_tag)
-                if quality_text:
+                if value:
                     try:
-                        quality = float(quality_text)
+                        quality = float(value)
                     except ValueError:
                         quality = None
             elif text.startswith('Difficulty:'):
-                difficulty_text = get_text_after_br(p_tag)
-                if difficulty_text:
+                if value:
                     try:
-                        difficulty = float(difficulty_text)
+                        difficulty = float(value)
                     except ValueError:
                         difficulty = None
         
@@ -123,7 +108,7 @@ class CrackmesPlatform(CTFPlatform):
             description=description,
             difficulty=difficulty,
             points=None,
-            files=[file],
+            files=files,
             additional_info=additional_info,
         )
 
@@ -4,11 +4,28 @@ from .base import CTFPlatform
 from ..models import Challenge, File
 from ..utils.config_handler import load_config
 from ..utils.challenge_handler import download_files
+from ..utils.extraction import Schema, Field
 from datetime import datetime
 import textwrap
 import requests
 
 class CrackmyPlatform(CTFPlatform):
+    challenge_schema = Schema(
+        title=Field(path="title"),
+        author_name=Field(path="author.name"),
+        description=Field(path="description"),
+        os=Field(path="os"),
+        architecture=Field(path="architecture"),
+        quality=Field(path="qualityRating"),
+        category=Field(path="category"),
+        rating=Field(path="rating"),
+        difficulty=Field(path="difficulty"),
+        difficulty_rating=Field(path="difficultyRating"),
+        file_id=Field(path="file.id"),
+        file_name=Field(path="file.fileName"),
+        file_hash=Field(path="file.fileSha256"),
+    )
+
     def __init__(self, url: str = "https://crackmy.app", config_file: str | Path = None):
         super().__init__(url)
         self.url = url
@@ -65,9 +82,6 @@ class CrackmyPlatform(CTFPlatform):
         except requests.RequestException:
             return False
 
-    def get_challenges(self) -> List[Challenge]:
-        raise NotImplementedError("Method not implemented")
-
     def get_challenge(self, challenge_url: str) -> Challenge:
         """Get a specific challenge by URL"""
 
@@ -82,27 +96,27 @@ class CrackmyPlatform(CTFPlatform):
         except requests.RequestException as e:
             raise Exception(f"Error fetching challenge {challenge_url}: {e}")
 
-        response = response.json()
-        title = response['title']
+        fields = self.challenge_schema.extract(response.json())
+        title = fields['title']
         id = title.replace(' ', '-').lower()
-        author_name = response['author']['name']
-        description = response['description']
+        author_name = fields['author_name']
+        description = fields['description']
 
         additional_info = {
-            'platform': response['os'],
-            'architecture': response['architecture'],
-            'quality': response['qualityRating'],
-            'category': response['category'],
-            'rating': response['rating'],
+            'platform': fields['os'],
+            'architecture': fields['architecture'],
+            'quality': fields['quality'],
+            'category': fields['category'],
+            'rating': fields['rating'],
         }
 
         difficulty = {
-            "difficulty": response["difficulty"],
-            "difficultyRating": response["difficultyRating"],
+            "difficulty": fields["difficulty"],
+            "difficultyRating": fields["difficulty_rating"],
         }
 
         try:
-            data = {"fileId":response['file']["id"]}
+            data = {"fileId":fields["file_id"]}
             download_request = self.session.post('https://crackmy.app/api/download/create', headers=self.headers, json=data).json()
         except requests.RequestException as e:
             raise Exception(f"Error fetching challenge {challenge_url}: {e}")
@@ -110,9 +124,9 @@ class CrackmyPlatform(CTFPlatform):
 
         files = [
             File(
-                name=response["file"]["fileName"],
+                name=fields["file_name"],
                 url=file_url,
-                hash=response["file"]["fileSha256"],
+                hash=fields["file_hash"],
             )
         ]
 
@@ -1,15 +1,30 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from pathlib import Path
-import requests
 from .base import CTFPlatform
 from ..models import Challenge, File
 from ..utils.challenge_handler import download_files
-from bs4 import BeautifulSoup
+from ..utils.html_parser import Regions
+from ..utils.extraction import Schema, Field
 from datetime import datetime
 import textwrap
 import re
 
 class ECSCPlatform(CTFPlatform):
+    # Labels and values are sibling spans, found with find_next in document order
+    challenge_regions = Regions("h1.documentFirstHeading", "span", "div.difficulty", "ul.other-artefacts")
+    challenge_schema = Schema(
+        title=Field("h1.documentFirstHeading"),
+        description=Field("span", after=("span", "Description"), optional=True, default=""),
+        difficulty=Field("div.difficulty span", after=("span", "Difficulty"), optional=True, default="Unknown"),
+        author=Field("span", after=("span", "Provider"), optional=True, default="Unknown"),
+        category=Field("span.challenge-tags span", after=("span", "Tags"), optional=True, default="Uncategorized"),
+        other_files=Field("ul.other-artefacts", after=("span", "Other artefacts"),
+                          get=lambda artefacts: [(a.text.strip(), a['href']) for a in artefacts.find_all('a')],
+                          optional=True, default=[]),
+        event=Field("span", after=("span", "Event")),
+        extra=Field("span", after=("span", "Additional Info"), optional=True, default=""),
+    )
+
     def __init__(self, url: str = "https://challenges.ecsc.eu"):
         super().__init__(url)
         self.headers = {
@@ -32,38 +47,20 @@ class ECSCPlatform(CTFPlatform):
         """Not implementing login since we don't need it :D"""
         return True
     
-    def get_challenges(self) -> List[Challenge]:
-        raise NotImplementedError("Method not implemented")
-    
-    def get_challenge(self, challenge_url: str) -> Challenge:
-        """Get a specific challenge by URL"""
-        try:
-            response = self.session.get(challenge_url, headers=self.headers)
-            if response.status_code != 200:
-                raise Exception(
-                    f"Error fetching challenge {challenge_url}: {response.status_code}"
-                )
-        except requests.RequestException as e:
-            raise Exception(f"Error fetching challenge {challenge_url}: {e}")
-        
-        response.encoding = "utf-8"  # Force UTF-8 encoding
-        soup = BeautifulSoup(response.text, "html.parser")
+    @classmethod
+    def parse_challenge_page(cls, challenge_url: str, content: bytes, html_parser: Optional[str] = None,
+                             release_tree: bool = False) -> Challenge:
+        """Build the challenge from its fetched page"""
+        fields = cls.extract_challenge_page(content, html_parser, release_tree)
 
 
-        title = soup.find('h1', class_='documentFirstHeading').text.strip()
+        title = fields["title"]
         id = title.lower().replace(' ', '-')  # Using lowercase title as ID
         
-        description_elem = soup.find('span', text='Description').find_next('span')
-        description = description_elem.text.strip() if description_elem else ""
-        
-        difficulty_elem = soup.find('span', text='Difficulty').find_next('div', class_='difficulty')
-        difficulty = difficulty_elem.find('span').text.strip() if difficulty_elem else "Unknown"
-        
-        provider_elem = soup.find('span', text='Provider').find_next('span')
-        author = provider_elem.text.strip() if provider_elem else "Unknown"
-        
-        tags_elem = soup.find('span', text='Tags').find_next('span', class_='challenge-tags')
-        category = tags_elem.find('span').text.strip() if tags_elem else "Uncategorized"
+        description = fields["description"]
+        difficulty = fields["difficulty"]
+        author = fields["author"]
+        category = fields["category"]
         
         files = []
         # write_ups_elem = soup.find('span', text='Write-ups').find_next('ul', class_='other-artefacts')
@@ -74,15 +71,12 @@ class ECSCPlatform(CTFPlatform):
         #             'url': file['href']
         #         })
         
-        other_files_elem = soup.find('span', text='Other artefacts').find_next('ul', class_='other-artefacts')
-        if other_files_elem:
-            for file in other_files_elem.find_all('a'):
-                files.append(File(name=file.text.strip(), url=file['href']))
+        for name, url in fields["other_files"]:
+            files.append(File(name=name, url=url))
         
-        additional_info_elem = soup.find('span', text='Additional Info').find_next('span')
         additional_info = {
-            'event': soup.find('span', text='Event').find_next('span').text.strip(),
-            'extra': additional_info_elem.text.strip() if additional_info_elem else ""
+            'event': fields["event"],
+            'extra': fields["extra"],
         }
         
         return Challenge(
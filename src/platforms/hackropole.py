@@ -1,17 +1,40 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from pathlib import Path
 import requests
 from .base import CTFPlatform
 from ..models import Challenge, File
 from ..utils.config_handler import load_config
 from ..utils.challenge_handler import download_files
-from bs4 import BeautifulSoup
+from ..utils.html_parser import Regions
+from ..utils.extraction import Schema, Field, stripped_text, attribute
 import unicodedata
 from datetime import datetime
 import textwrap
 
 
+def _nfkd(text: str) -> str:
+    return unicodedata.normalize("NFKD", text)
+
+
 class HackropolePlatform(CTFPlatform):
+    rate_limit = 3.0
+    rate_burst = 3
+    max_concurrency = 4
+    challenge_regions = Regions(".jumbotron", ".markdown", ".list-file", ".col.text-center", "svg.text-warning")
+    challenge_schema = Schema(
+        title=Field(".jumbotron h1", get=stripped_text, post=_nfkd),
+        badges=Field(".jumbotron .badge", get=stripped_text, post=_nfkd, many=True),
+        description=Field(".markdown p", get=stripped_text, post=_nfkd),
+        files=Field(".list-file li", many=True, schema=Schema(
+            link=Field("a", get=attribute("href")),
+            download=Field("a", get=attribute("download")),
+            hash=Field(".clip-sha256", get=stripped_text, optional=True),
+        )),
+        author_name=Field(".col.text-center .font-monospace", get=stripped_text, post=_nfkd),
+        author_avatar=Field(".col.text-center img", get=attribute("src")),
+        stars=Field("svg.text-warning title", get=stripped_text, many=True),
+    )
+
     def __init__(self, url: str = "https://hackropole.fr", config_file: str | Path = None):
         super().__init__(url)
         if config_file:
@@ -59,69 +82,20 @@ class HackropolePlatform(CTFPlatform):
         except requests.RequestException:
             return False
 
-    def get_challenges(self) -> List[Challenge]:
-        raise NotImplementedError("Method not implemented")
-
-    def get_challenge(self, challenge_url: str) -> Challenge:
-        """Get a specific challenge by URL"""
-        try:
-            response = self.session.get(challenge_url, headers=self.headers)
-            if response.status_code != 200:
-                raise Exception(
-                    f"Error fetching challenge {challenge_url}: {response.status_code}"
-                )
-        except requests.RequestException as e:
-            raise Exception(f"Error fetching challenge {challenge_url}: {e}")
-
-        response.encoding = "utf-8"  # Force UTF-8 encoding
-        soup = BeautifulSoup(response.text, "html.parser")
+    @classmethod
+    def parse_challenge_page(cls, challenge_url: str, content: bytes, html_parser: Optional[str] = None,
+                             release_tree: bool = False) -> Challenge:
+        """Build the challenge from its fetched page"""
+        fields = cls.extract_challenge_page(content, html_parser, release_tree)
 
-        title = unicodedata.normalize(
-            "NFKD", soup.select_one(".jumbotron h1").get_text(strip=True)
-        )
+        title = fields["title"]
         id = "-".join([word.lower() for word in title.split()])
 
-        badges = [
-            unicodedata.normalize("NFKD", badge.get_text(strip=True))
-            for badge in soup.select(".jumbotron .badge")
-            if "résolu le"
-            not in unicodedata.normalize("NFKD", badge.get_text(strip=True))
-        ]
-        description = unicodedata.normalize(
-            "NFKD", soup.select_one(".markdown p").get_text(strip=True)
-        )
-
-        file_links = []
-        file_names = []
-        file_hashes = {}
-        file_elements = soup.select(".list-file li")
-        for element in file_elements:
-            link = element.select_one("a")["href"]
-            name = (
-                element.select_one("a").get("download")
-                or element.select_one("a")["href"].split("/")[-1]
-            )
-            file_links.append(link)
-            file_names.append(name)
-            hash_element = element.select_one(".clip-sha256")
-            if hash_element:
-                hash_text = hash_element.get_text(strip=True)
-                file_hash = hash_text.split("–")[-1].strip()
-                file_hashes[name] = file_hash
-
-        author_name = unicodedata.normalize(
-            "NFKD",
-            soup.select_one(".col.text-center .font-monospace").get_text(strip=True),
-        )
-        author_avatar = soup.select_one(".col.text-center img")["src"]
-
-        stars = len(
-            [
-                star
-                for star in soup.select("svg.text-warning")
-                if star.select_one("title").get_text(strip=True) == "star"
-            ]
-        )
+        badges = [badge for badge in fields["badges"] if "résolu le" not in badge]
+        description = fields["description"]
+        author_name = fields["author_name"]
+        author_avatar = fields["author_avatar"]
+        stars = len([title for title in fields["stars"] if title == "star"])
 
         available_categories = [
             "crypto",
@@ -132,15 +106,17 @@ class HackropolePlatform(CTFPlatform):
             "reverse",
             "web",
         ]
+        category = None
         for badge in badges:
             if badge.lower() in available_categories:
                 category = badge
                 break
 
-        files = [
-            File(name=file_name, hash=file_hashes.get(file_name), url=file_link)
-            for file_name, file_link in zip(file_names, file_links)
-        ]
+        files = []
+        for file in fields["files"]:
+            name = file["download"] or file["link"].split("/")[-1]
+            file_hash = file["hash"].split("–")[-1].strip() if file["hash"] else None
+            files.append(File(name=name, hash=file_hash, url=file["link"]))
 
         return Challenge(
             id=id,
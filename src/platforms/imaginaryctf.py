@@ -1,16 +1,38 @@
-from typing import List, Dict
+from typing import List, Dict, Iterator
 from pathlib import Path
 from .base import CTFPlatform
 from ..models import Challenge, File
 from ..utils.config_handler import load_config
 from ..utils.challenge_handler import download_files
-from bs4 import BeautifulSoup
+from ..utils.html_parser import parse_html
+from ..utils.extraction import Schema, Field, attribute, element
 from datetime import datetime
 import textwrap
 import requests
 import re
 
 class ImaginaryCTFPlatform(CTFPlatform):
+    listing_schema = Schema(
+        modals=Field("div[id]", get=element, many=True),
+        headers_and_cards=Field("h3.text-start, div.card.challenge", get=element, many=True),
+    )
+    card_schema = Schema(
+        header=Field("div.challenge-header", optional=True),
+        target=Field("a", get=attribute("data-bs-target")),
+    )
+    modal_schema = Schema(
+        author=Field("h5.modal-title small.text-muted", post=lambda text: text.replace('by', '').strip()),
+        solve_count=Field("h5.modal-title span", post=lambda text: int(text.split('solves')[0].strip('- '))),
+        description=Field("p"),
+        files=Field("p", after=("b", "Attachments"), get=lambda p: [a['href'] for a in p.find_all('a')],
+                    optional=True, default=[]),
+    )
+    container_schema = Schema(
+        id=Field(path="id"),
+        signature=Field(path="signature"),
+        uploads=Field(path="uploads"),
+    )
+
     def __init__(self, url: str = "https://imaginaryctf.org/"):
         super().__init__(url)
         self.url = url
@@ -35,8 +57,12 @@ class ImaginaryCTFPlatform(CTFPlatform):
         """Not implementing login since we don't need it :D"""
         return True
     
-    def get_challenges(self) -> List[Challenge]:
-        """Get all challenges from platform"""
+    def challenge_key(self, challenge: Challenge) -> str:
+        """Every challenge shares the listing URL, so they are keyed by id"""
+        return challenge.id
+
+    def iter_challenges(self) -> Iterator[Challenge]:
+        """Yield the challenges of the listing, their attachments not resolved yet"""
         try:
             response = self.session.get('https://imaginaryctf.org/Challenges', headers=self.headers)
             if response.status_code != 200:
@@ -44,59 +70,57 @@ class ImaginaryCTFPlatform(CTFPlatform):
         except requests.RequestException as e:
             raise Exception(f"Error fetching challenges: {e}")
         
-        response.encoding = "utf-8"
-        soup = BeautifulSoup(response.text, 'html.parser')
-        challenges = {}
-        
-        for category_header in soup.find_all('h3', class_='text-start'):
-            category = category_header.text.strip()
-            
-            current_element = category_header.find_next('div', class_='card challenge')
-            
-            while current_element and not current_element.find_parent('h3'):
-                header = current_element.find('div', class_='challenge-header')
-                if not header:
-                    continue
-                    
-                header_text = header.text.strip()
-                name = header_text.split('(')[0].strip()
-                points = int(header_text.split('(')[1].split('pts')[0].strip())
-                
-                modal_id = current_element.find('a')['data-bs-target'].replace('#', '')
-                modal = soup.find('div', id=modal_id)
-                
-                if modal:
-                    modal_title = modal.find('h5', class_='modal-title')
-                    author = modal_title.find('small', class_='text-muted').text.replace('by', '').strip()
-                    solve_count = int(modal_title.find('span').text.split('solves')[0].strip('- '))
-                    
-                    description = modal.find('p').text.strip()
-                    
-                    files = []
-                    attachments_section = modal.find('b', text='Attachments')
-                    if attachments_section:
-                        files = [a['href'] for a in attachments_section.find_next('p').find_all('a')]
-                    
-                    challenge_id = name.lower().replace(' ', '-')
-                    
-                    challenge = Challenge(
-                        id=challenge_id,
-                        url='https://imaginaryctf.org/Challenges',
-                        platform="ImaginaryCTF",
-                        name=name,
-                        author=author,
-                        category=category,
-                        description=description,
-                        points=points,
-                        files=files,
-                        solved_number=solve_count
-                    )
-                    
-                    challenges[challenge_id] = challenge
-                
-                current_element = current_element.find_next('div', class_='card challenge')
-        
-        self.challenges = challenges
+        soup = parse_html(response.content, self.html_parser)
+
+        listing = self.listing_schema.extract(soup)
+        # Index every modal once instead of searching the document for each card
+        modals = {modal['id']: modal for modal in listing["modals"]}
+
+        # Headers and cards come back in document order, so each card belongs
+        # to the last category header seen before it
+        category = None
+        for element in listing["headers_and_cards"]:
+            if element.name == 'h3':
+                category = element.text.strip()
+                continue
+            if category is None:
+                continue
+
+            card = self.card_schema.extract(element)
+            if not card["header"]:
+                continue
+
+            header_text = card["header"]
+            name = header_text.split('(')[0].strip()
+            points = int(header_text.split('(')[1].split('pts')[0].strip())
+
+            modal = modals.get(card["target"].replace('#', ''))
+
+            if modal:
+                details = self.modal_schema.extract(modal)
+                author = details["author"]
+                solve_count = details["solve_count"]
+                description = details["description"]
+                files = details["files"]
+
+                challenge_id = name.lower().replace(' ', '-')
+
+                challenge = Challenge(
+                    id=challenge_id,
+                    url='https://imaginaryctf.org/Challenges',
+                    platform="ImaginaryCTF",
+                    name=name,
+                    author=author,
+                    category=category,
+                    description=description,
+                    points=points,
+                    files=files,
+                    solved_number=solve_count
+                )
+
+                # get_challenge looks challenges up by id
+                self.challenges[self.challenge_key(challenge)] = challenge
+                yield challenge
 
     def resolve_challenge_files(self, file_url: Challenge):
         """Resolve file URL to get direct download link it"""
@@ -122,11 +146,11 @@ class ImaginaryCTFPlatform(CTFPlatform):
         response = self.session.post(api_url, headers=headers, json=data)
         if response.status_code != 200:
             raise Exception(f"Error fetching file: {response.status_code}")
-        response = response.json()
-        folder_id = response['id']
-        signature = response['signature']
+        container = self.container_schema.extract(response.json())
+        folder_id = container['id']
+        signature = container['signature']
         files = []
-        for upload in response['uploads']:
+        for upload in container['uploads']:
             name = upload['fileName']
             file_url = f"https://cybersharing.net/api/download/file/{folder_id}/{upload['id']}/{signature}/{name}"
             hash = None
@@ -136,9 +160,11 @@ class ImaginaryCTFPlatform(CTFPlatform):
         return files
     
     def get_challenge(self, challenge_url: str) -> Challenge:
-        """Get a specific challenge by URL"""
-        
-        challenge = self.challenges.get(challenge_url)
+        """Get a listed challenge by id, with its attachments resolved"""
+        return self.complete_challenge(self.challenges.get(challenge_url))
+
+    def complete_challenge(self, challenge: Challenge) -> Challenge:
+        """Resolve the attachments of a listed challenge, the rest is already in the listing"""
         not_resolved_files = challenge.files
         allfiles = []
         for file_url in not_resolved_files:
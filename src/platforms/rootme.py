@@ -1,16 +1,64 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Iterator
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urljoin, urldefrag, urlparse
 from pathlib import Path
 from .base import CTFPlatform
 from ..models import Challenge, File
 from ..utils.config_handler import load_config
 from ..utils.challenge_handler import download_files
-from bs4 import BeautifulSoup
+from ..utils.html_parser import parse_html, release_tree, Regions
+from ..utils.extraction import Schema, Field, attribute
 from datetime import datetime
 import textwrap
 import requests
 import re
 
+# Category pages are the only /Challenges/<Category>/ links on the index
+_CATEGORY_PATH = re.compile(r"/Challenges/([^/]+)/$")
+
+
+def _number(text: str) -> Optional[int]:
+    match = re.search(r"\d+", text.replace(',', '').replace(' ', ''))
+    return int(match.group()) if match else None
+
+
 class RootMePlatform(CTFPlatform):
+    # root-me.org bans aggressive clients quickly
+    rate_limit = 1.0
+    rate_burst = 2
+    max_concurrency = 2
+    challenge_regions = Regions(
+        "h1.challenge-titre-41", "a.txt_0minirezo", "h2.challenge-score-41", "div.challenge-descriptif-41",
+        "a[class^=difficulte]", "a.button.small.radius", "a[title=Qui a validé ?]",
+        "span.notation_valeur", "span.left.gras",
+    )
+    challenge_schema = Schema(
+        title=Field("h1.challenge-titre-41"),
+        author=Field("a.txt_0minirezo"),
+        points=Field("h2.challenge-score-41"),
+        description=Field("div.challenge-descriptif-41"),
+        difficulties=Field("a[class^=difficulte]", get=lambda link: (link['class'][-1], link['title']), many=True),
+        file_links=Field("a.button.small.radius", get=attribute("href"), many=True),
+        validations=Field("a[title=Qui a validé ?]"),
+        votes=Field("span.notation_valeur"),
+        completion_rate=Field("span.left.gras", optional=True),
+    )
+    challenges_path = "fr/Challenges/"
+    index_regions = Regions("a[href*=Challenges/]")
+    index_schema = Schema(links=Field("a[href*=Challenges/]", get=attribute("href"), many=True))
+    # One category page: a table of challenges, then links to its other pages
+    listing_regions = Regions("table.countlist", "a.lien_pagination")
+    listing_schema = Schema(
+        headers=Field("table.countlist th", many=True),
+        rows=Field("table.countlist tr", many=True, schema=Schema(
+            link=Field("td a[href*=Challenges/]", get=lambda link: (link['href'], link.text.strip()), optional=True),
+            cells=Field("td", many=True),
+            difficulty=Field("a[class^=difficulte]", get=attribute("title"), optional=True),
+            author=Field("a.txt_0minirezo", optional=True),
+        )),
+        pages=Field("a.lien_pagination", get=attribute("href"), many=True),
+    )
+
     def __init__(self, url: str = "https://www.root-me.org/", config_file: str | Path = None):
         super().__init__(url)
         self.url = url
@@ -30,6 +78,8 @@ class RootMePlatform(CTFPlatform):
             'upgrade-insecure-requests': '1',
             'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36',
         }
+        # Listing pages that failed during the last iter_challenges, by URL
+        self.listing_errors: Dict[str, Exception] = {}
         if config_file:
             self.load_config(config_file)
             self.login()
@@ -46,7 +96,7 @@ class RootMePlatform(CTFPlatform):
         params = (('page', 'login'),('lang', 'fr'),('ajah', '1'),)
         data = {'triggerAjaxLoad': '',}
         response = self.session.post('https://www.root-me.org/', headers=self.headers, params=params, data=data)
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = parse_html(response.content, self.html_parser)
         form_hidden = soup.find('span', class_='form-hidden')
         formulaire_action_args = form_hidden.find('input', {'name': 'formulaire_action_args'})['value']
 
@@ -59,51 +109,129 @@ class RootMePlatform(CTFPlatform):
             raise Exception("Login failed")
 
     
-    def get_challenges(self) -> List[Challenge]:
-        """Get all challenges from platform"""
-        raise NotImplementedError("RootMePlatform does not support fetching all challenges")
-    
-    def get_challenge(self, challenge_url: str) -> Challenge:
-        """Get a specific challenge by URL"""
+    def iter_challenges(self) -> Iterator[Challenge]:
+        """
+        Crawl the category listings and yield challenge stubs as pages arrive
+
+        Stubs only hold what the category listings show (name, category,
+        points, difficulty, author, validations); description and files are
+        left to get_challenge, for the challenges actually needed.
+
+        Categories and their pages are fetched concurrently, up to
+        max_concurrency at once, so the crawl stays within the rate budget.
+        Pages linked from a fetched page are queued as they are discovered.
+        A page that fails is skipped and kept in self.listing_errors.
+        """
+        self.listing_errors = {}
+        index = self._fetch_listing_page(urljoin(self.url, self.challenges_path), self.index_regions, self.index_schema)
+        categories = []
+        for href in index["links"]:
+            url = urldefrag(urljoin(self.url, href))[0]
+            if _CATEGORY_PATH.search(urlparse(url).path) and url not in categories:
+                categories.append(url)
+        if not categories:
+            raise Exception("No challenge category found on Root-Me")
+
+        seen = set(categories)
+        with ThreadPoolExecutor(max_workers=self.rate_limiter.max_concurrency) as executor:
+            pending = {
+                executor.submit(self._fetch_listing_page, url, self.listing_regions, self.listing_schema): url
+                for url in categories
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page_url = pending.pop(future)
+                    try:
+                        listing = future.result()
+                    except Exception as e:
+                        print(f"Skipping listing page {page_url}: {e}")
+                        self.listing_errors[page_url] = e
+                        continue
+                    for href in listing["pages"]:
+                        # Root-Me pages set <base href> to the site root
+                        url = urldefrag(urljoin(self.url, href))[0]
+                        if url not in seen:
+                            seen.add(url)
+                            pending[executor.submit(
+                                self._fetch_listing_page, url, self.listing_regions, self.listing_schema)] = url
+                    yield from self._listing_stubs(page_url, listing)
+
+    def _fetch_listing_page(self, url: str, regions: Regions, schema: Schema) -> Dict:
         try:
-            response = self.session.get(challenge_url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers)
             if response.status_code != 200:
-                raise Exception(f"Error fetching challenges: {response.status_code}")
+                raise Exception(f"Error fetching {url}: {response.status_code}")
         except requests.RequestException as e:
-            raise Exception(f"Error fetching challenges: {e}")
-        
-        response.encoding = "utf-8"
-        soup = BeautifulSoup(response.text, 'html.parser')
+            raise Exception(f"Error fetching {url}: {e}")
+        soup = parse_html(response.content, self.html_parser, regions=regions)
+        try:
+            return schema.extract(soup)
+        finally:
+            if self.release_trees:
+                release_tree(soup)
+
+    def _listing_stubs(self, page_url: str, listing: Dict) -> Iterator[Challenge]:
+        headers = [header.lower() for header in listing["headers"]]
+        points_column = next((i for i, header in enumerate(headers) if 'point' in header), None)
+        validations_column = next((i for i, header in enumerate(headers) if 'validation' in header), None)
+        category = urlparse(page_url).path.rstrip('/').split('/')[-1]
+
+        for row in listing["rows"]:
+            if not row["link"]:
+                continue
+            href, title = row["link"]
+            cells = row["cells"]
+            points = _number(cells[points_column]) if points_column is not None and points_column < len(cells) else None
+            solved = (_number(cells[validations_column])
+                      if validations_column is not None and validations_column < len(cells) else None)
+            difficulty = row["difficulty"].split(':')[0].strip() if row["difficulty"] else "Unknown"
+            yield Challenge(
+                id=title.lower().replace(' ', '-'),
+                url=urldefrag(urljoin(self.url, href))[0],
+                platform="Root-Me",
+                name=title,
+                author=row["author"],
+                category=category,
+                description=None,
+                difficulty=difficulty,
+                points=points,
+                files=None,
+                solved_number=solved or 0,
+            )
+    
+    @classmethod
+    def parse_challenge_page(cls, challenge_url: str, content: bytes, html_parser: Optional[str] = None,
+                             release_tree: bool = False) -> Challenge:
+        """Build the challenge from its fetched page"""
+        fields = cls.extract_challenge_page(content, html_parser, release_tree)
 
-        title = soup.find('h1', {'class': 'challenge-titre-41'}).text.strip()
+        title = fields["title"]
         
         id = title.lower().replace(' ', '-')
-        author = soup.find('a', {'class': 'txt_0minirezo'}).text.strip()
-        points = int(soup.find('h2', {'class': 'challenge-score-41'}).text.split()[0])
-        description = soup.find('div', {'class': 'challenge-descriptif-41'}).text.strip()
+        author = fields["author"]
+        points = int(fields["points"].split()[0])
+        description = fields["description"]
         
         # category_img = soup.find('a', {'href': re.compile(r'fr/Challenges/[^/]+/')})
         # category = category_img['href'].split('/')[2] if category_img else "Uncategorized"
         category = challenge_url.split('/')[-2]
 
-        difficulty_elements = soup.find_all('a', {'class': re.compile(r'difficulte.*')})
         difficulty = "Unknown"
-        for elem in difficulty_elements:
-            if 'a' in elem['class'][-1]:  # Check if the last class ends with 'a'
-                difficulty = elem['title'].split(':')[0].strip()
+        for last_class, difficulty_title in fields["difficulties"]:
+            if 'a' in last_class:  # Check if the last class ends with 'a'
+                difficulty = difficulty_title.split(':')[0].strip()
                 break
         
         files = []
-        file_links = soup.find_all('a', {'class': 'button small radius'})
-        for link in file_links:
-            filename = link['href'].split('/')[-1]
-            files.append(File(name=filename, url=link['href'], hash=None))
+        for link in fields["file_links"]:
+            filename = link.split('/')[-1]
+            files.append(File(name=filename, url=link, hash=None))
         
-        validations = soup.find('a', {'title': 'Qui a validé ?'}).text.strip().split()[0]
-        votes = soup.find('span', {'class': 'notation_valeur'}).text.strip().split()[0]
+        validations = fields["validations"].split()[0]
+        votes = fields["votes"].split()[0]
         
-        completion_div = soup.find('span', {'class': 'left gras'})
-        completion_rate = completion_div.text.strip().replace('%', '') if completion_div else "Unknown"
+        completion_rate = fields["completion_rate"].replace('%', '') if fields["completion_rate"] else "Unknown"
         
         solve_count = int(validations.replace(',', ''))
         additional_info = {
@@ -1,16 +1,30 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from pathlib import Path
 import requests
 from .base import CTFPlatform
 from ..models import Challenge, File
 from ..utils.cookie_handler import load_cookies_from_file
 from ..utils.challenge_handler import download_files
-from bs4 import BeautifulSoup
+from ..utils.html_parser import Regions
+from ..utils.extraction import Schema, Field, attribute
 from datetime import datetime
 import textwrap
-import re
 
 class TheBlackSidePlatform(CTFPlatform):
+    challenge_regions = Regions("main")
+    challenge_schema = Schema(
+        title=Field("main h1"),
+        description=Field("main p"),
+        # The profile link wraps a span holding a second link with the name
+        author_name=Field("main a[href*=/profil/] span a", optional=True),
+        buttons=Field("main div.metadata div.button", many=True, schema=Schema(
+            value=Field("span"),
+            solved_icon=Field("svg.feather-check-circle", get=bool, optional=True, default=False),
+        )),
+        category=Field("main div.metadata a[href*=/challenges/] span", optional=True, default="Uncategorized"),
+        file_url=Field("main a.startChall", get=attribute("href")),
+    )
+
     def __init__(
         self, url: str = "https://theblackside.fr/", cookies_file: str | Path = None
     ):
@@ -57,11 +71,7 @@ class TheBlackSidePlatform(CTFPlatform):
         except requests.exceptions.RequestException:
             raise Exception("Failed to login")
         
-    def get_challenges(self) -> List[Challenge]:
-        raise NotImplementedError("Method not implemented")
-
-    def get_challenge(self, challenge_url: str) -> Challenge:
-        """Get a specific challenge by URL"""
+    def fetch_challenge_page(self, challenge_url: str) -> bytes:
         try:
             response = self.session.get(challenge_url, headers=self.headers, cookies=self.cookie)
             if response.status_code != 200:
@@ -70,27 +80,22 @@ class TheBlackSidePlatform(CTFPlatform):
                 )
         except requests.RequestException as e:
             raise Exception(f"Error fetching challenge {challenge_url}: {e}")
-        
-        response.encoding = "utf-8"  # Force UTF-8 encoding
-        soup = BeautifulSoup(response.text, "html.parser")
+        return response.content
 
-        main = soup.find('main')
+    @classmethod
+    def parse_challenge_page(cls, challenge_url: str, content: bytes, html_parser: Optional[str] = None,
+                             release_tree: bool = False) -> Challenge:
+        """Build the challenge from its fetched page"""
+        fields = cls.extract_challenge_page(content, html_parser, release_tree)
 
-        title = main.find('h1').text.strip()
+        title = fields["title"]
         id = "-".join([word.lower() for word in title.split()])
-        description = main.find('p').text.strip()
-        
-        author_link = main.find('a', href=re.compile(r'/profil/'))
-        author_name = author_link.find('span').find('a').text.strip() if author_link else None
-        
-        metadata_div = main.find('div', class_='metadata')
-        points = int(metadata_div.find('div', class_='button').find('span').text.strip())
-        solved_number = int([div for div in metadata_div.find_all('div', class_='button') 
-                            if div.find('svg', class_='feather-check-circle')][0]
-                        .find('span').text.strip())
-        
-        category_button = metadata_div.find('a', href=re.compile(r'/challenges/'))
-        category = category_button.find('span').text.strip() if category_button else "Uncategorized"
+        description = fields["description"]
+        author_name = fields["author_name"]
+
+        points = int(fields["buttons"][0]["value"])
+        solved_number = int([button for button in fields["buttons"] if button["solved_icon"]][0]["value"])
+        category = fields["category"]
 
         categorydict = {
             "Web": "Web",
@@ -107,7 +112,7 @@ class TheBlackSidePlatform(CTFPlatform):
         category = categorydict.get(category, category)
 
         
-        file_url = main.find('a', class_='startChall')['href']
+        file_url = fields["file_url"]
 
         file = File(
             name=file_url.split('/')[-1],
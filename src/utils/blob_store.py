@@ -0,0 +1,68 @@
+from typing import Optional
+from pathlib import Path
+import tempfile
+import shutil
+import os
+
+
+class BlobStore:
+    """
+    Content-addressed store for downloaded challenge files
+
+    Blobs live under <root>/<first two hex chars>/<sha256>, so identical files are
+    kept once across challenges and runs and can be linked into place instead of
+    being downloaded again.
+    """
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def normalize_hash(file_hash: Optional[str]) -> Optional[str]:
+        """Return a lowercase hex digest, or None if file_hash is not a SHA-256"""
+        if not file_hash:
+            return None
+        file_hash = file_hash.strip().lower()
+        if file_hash.startswith("sha256:"):
+            file_hash = file_hash[len("sha256:"):]
+        if len(file_hash) != 64 or any(c not in "0123456789abcdef" for c in file_hash):
+            return None
+        return file_hash
+
+    def path_for(self, file_hash: str) -> Path:
+        return self.root / file_hash[:2] / file_hash
+
+    def has(self, file_hash: str) -> bool:
+        return self.path_for(file_hash).is_file()
+
+    def add(self, file_path: Path, file_hash: str):
+        """
+        Store file_path under its (already computed) hash
+
+        Safe when several threads or processes add the same file at once: each
+        copies to its own temp file, and a blob put in place by another writer
+        counts as stored.
+        """
+        blob_path = self.path_for(file_hash)
+        if blob_path.exists():
+            return
+        blob_path.parent.mkdir(exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=blob_path.parent, prefix=blob_path.name + ".", suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(file_path, tmp_path)
+            os.chmod(tmp_path, 0o444)
+            os.replace(tmp_path, blob_path)
+        except OSError:
+            Path(tmp_path).unlink(missing_ok=True)
+            if not blob_path.exists():
+                raise
+
+    def link_to(self, file_hash: str, file_path: Path):
+        """Place the blob at file_path, hard-linking when possible"""
+        blob_path = self.path_for(file_hash)
+        file_path.unlink(missing_ok=True)
+        try:
+            os.link(blob_path, file_path)
+        except OSError:
+            shutil.copyfile(blob_path, file_path)
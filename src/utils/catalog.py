@@ -0,0 +1,97 @@
+from typing import Dict, Iterable, Optional, Set
+from datetime import datetime
+from pathlib import Path
+import hashlib
+import threading
+import json
+import os
+
+from ..models import Challenge, File
+
+# Listing fields whose change means a challenge has to be fetched again
+FINGERPRINT_FIELDS = ("points", "solved_number", "files")
+
+
+def _file_key(file) -> str:
+    if isinstance(file, File):
+        return file.hash or file.url
+    return str(file)
+
+
+def fingerprint(challenge: Challenge, fields: Iterable[str] = FINGERPRINT_FIELDS) -> str:
+    """
+    Hash of the listing-level fields of a challenge
+
+    Args:
+        challenge (Challenge): Challenge as listed by the platform
+        fields (Iterable[str]): Challenge attributes to include
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    values = []
+    for field in fields:
+        value = getattr(challenge, field)
+        if field == "files":
+            value = sorted(_file_key(file) for file in value or [])
+        values.append(value)
+    return hashlib.sha256(json.dumps(values, default=str).encode("utf-8")).hexdigest()
+
+
+class Catalog:
+    """
+    Challenges seen by previous runs, kept in one JSON file
+
+    Entries are grouped by platform and keyed by challenge id. Each holds the
+    challenge URL, the fingerprint of its listing fields, when it was last
+    listed and when it was last fetched. save() writes the file atomically.
+    """
+    def __init__(self, path: str | Path, fields: Iterable[str] = FINGERPRINT_FIELDS):
+        self.path = Path(path)
+        self.fields = tuple(fields)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Dict]] = {}
+        if self.path.exists():
+            self._entries = json.loads(self.path.read_text())
+
+    def fingerprint(self, challenge: Challenge) -> str:
+        return fingerprint(challenge, self.fields)
+
+    def get(self, platform: str, challenge_id: str) -> Optional[Dict]:
+        with self._lock:
+            return self._entries.get(platform, {}).get(challenge_id)
+
+    def ids(self, platform: str) -> Set[str]:
+        with self._lock:
+            return set(self._entries.get(platform, {}))
+
+    def mark_listed(self, challenge: Challenge):
+        """Record that the listing still shows challenge"""
+        with self._lock:
+            entry = self._entries.get(challenge.platform, {}).get(challenge.id)
+            if entry is not None:
+                entry["listed_at"] = datetime.now().isoformat()
+
+    def record(self, challenge: Challenge, challenge_fingerprint: str):
+        """Record that challenge was fetched while its listing had challenge_fingerprint"""
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._entries.setdefault(challenge.platform, {})[challenge.id] = {
+                "url": challenge.url,
+                "fingerprint": challenge_fingerprint,
+                "listed_at": now,
+                "fetched_at": now,
+            }
+
+    def remove(self, platform: str, challenge_ids: Iterable[str]):
+        with self._lock:
+            entries = self._entries.get(platform, {})
+            for challenge_id in challenge_ids:
+                entries.pop(challenge_id, None)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with self._lock:
+            tmp_path.write_text(json.dumps(self._entries, indent=1, sort_keys=True))
+        os.replace(tmp_path, self.path)
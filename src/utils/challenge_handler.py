@@ -1,10 +1,207 @@
 from ..models import Challenge, File
-from typing import List
+from .blob_store import BlobStore
+from .archive_handler import extract_zip, is_encrypted
+from typing import List, Optional
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import requests
+import hashlib
 import zipfile
+import json
+import time
 import os
 
+CHUNK_SIZE = 1024 * 1024
+SEGMENT_MIN_SIZE = 8 * 1024 * 1024
+# The resume journal is rewritten at most every JOURNAL_BYTES or JOURNAL_SECONDS
+JOURNAL_BYTES = 8 * 1024 * 1024
+JOURNAL_SECONDS = 2.0
+
+
+def _content_range_start(value: Optional[str]) -> Optional[int]:
+    """Return the first byte of a "bytes <start>-<end>/<size>" Content-Range, if valid"""
+    if not value or not value.startswith("bytes "):
+        return None
+    try:
+        return int(value[len("bytes "):].split("-", 1)[0])
+    except ValueError:
+        return None
+
+
+def _read_journal(journal_path: Path, tmp_path: Path, file_url: str) -> Optional[dict]:
+    """Return the journal of a resumable partial download of file_url, if any"""
+    if not journal_path.exists() or not tmp_path.exists():
+        return None
+    try:
+        journal = json.loads(journal_path.read_text())
+    except ValueError:
+        return None
+    if journal.get("url") != file_url or not journal.get("validator"):
+        return None
+    # The part file is authoritative if the journal lags behind the last write
+    journal["received"] = min(journal.get("received", 0), tmp_path.stat().st_size)
+    return journal
+
+
+def _hash_prefix(path: Path, length: int, chunk_size: int = CHUNK_SIZE):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        remaining = length
+        while remaining:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest
+
+
+def stream_download(session: requests.Session, file_url: str, file_path: Path,
+                    expected_hash: Optional[str] = None, chunk_size: int = CHUNK_SIZE) -> Optional[str]:
+    """
+    Stream a file to disk in fixed-size chunks, hashing it on the way
+
+    The body is written to a <name>.part file next to file_path and renamed into
+    place only once complete, so memory use does not depend on the file size and
+    an interrupted download never leaves a truncated file under the final name.
+
+    A <name>.part.json journal records the URL, the validator (ETag or
+    Last-Modified) and the bytes received, updated every JOURNAL_BYTES or
+    JOURNAL_SECONDS. If a previous attempt was interrupted, the download resumes
+    with a Range/If-Range request; when the server ignores the range or the
+    validator changed, it answers 200 and the file restarts. So does a 206 whose
+    Content-Range does not start at the bytes received.
+
+    Args:
+        expected_hash (str, optional): SHA-256 the content must match
+
+    Returns:
+        Optional[str]: SHA-256 hex digest of the file, or None if the server did not answer 200
+    """
+    tmp_path = file_path.with_name(file_path.name + ".part")
+    journal_path = file_path.with_name(file_path.name + ".part.json")
+    # Byte offsets only make sense on the unencoded representation
+    headers = {"Accept-Encoding": "identity"}
+
+    journal = _read_journal(journal_path, tmp_path, file_url)
+    if journal and journal["received"]:
+        headers["Range"] = f"bytes={journal['received']}-"
+        headers["If-Range"] = journal["validator"]
+
+    with session.get(file_url, headers=headers, stream=True) as response:
+        if "Range" in headers and (
+            response.status_code == 416
+            or response.status_code == 206
+            and _content_range_start(response.headers.get("Content-Range")) != journal["received"]
+        ):
+            # Stale journal, e.g. the file shrank, or a range we did not ask for: start over
+            journal_path.unlink(missing_ok=True)
+            tmp_path.unlink(missing_ok=True)
+            return stream_download(session, file_url, file_path, expected_hash, chunk_size)
+        if response.status_code == 206 and "Range" in headers:
+            offset = journal["received"]
+            digest = _hash_prefix(tmp_path, offset)
+            mode = "r+b"
+            print(f"Resuming {file_path.name} at byte {offset}")
+        elif response.status_code == 200:
+            offset = 0
+            digest = hashlib.sha256()
+            mode = "wb"
+            journal = {
+                "url": file_url,
+                "validator": response.headers.get("ETag") or response.headers.get("Last-Modified"),
+                "received": 0,
+            }
+        else:
+            return None
+
+        with open(tmp_path, mode) as f:
+            f.seek(offset)
+            f.truncate()
+            journaled_at, journaled_bytes = time.monotonic(), offset
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                digest.update(chunk)
+                f.write(chunk)
+                if journal["validator"] and (
+                    f.tell() - journaled_bytes >= JOURNAL_BYTES
+                    or time.monotonic() - journaled_at >= JOURNAL_SECONDS
+                ):
+                    # The journal may lag behind the file, never run ahead of it
+                    f.flush()
+                    journal["received"] = journaled_bytes = f.tell()
+                    journal_path.write_text(json.dumps(journal))
+                    journaled_at = time.monotonic()
+
+    journal_path.unlink(missing_ok=True)
+    file_hash = digest.hexdigest()
+    if expected_hash and file_hash != expected_hash:
+        tmp_path.unlink(missing_ok=True)
+        raise Exception(f"Hash mismatch for {file_url}: expected {expected_hash}, got {file_hash}")
+    os.replace(tmp_path, file_path)
+    return file_hash
+
+def _fetch_segment(session: requests.Session, file_url: str, tmp_path: Path, start: int, end: int,
+                   validator: Optional[str], chunk_size: int):
+    headers = {"Accept-Encoding": "identity", "Range": f"bytes={start}-{end}"}
+    if validator:
+        headers["If-Range"] = validator
+    with session.get(file_url, headers=headers, stream=True) as response:
+        if response.status_code != 206:
+            raise Exception(f"Range request {start}-{end} for {file_url} answered {response.status_code}")
+        with open(tmp_path, "r+b") as f:
+            f.seek(start)
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+            if f.tell() != end + 1:
+                raise Exception(f"Range request {start}-{end} for {file_url} ended at byte {f.tell()}")
+
+
+def segmented_download(session: requests.Session, file_url: str, file_path: Path,
+                       expected_hash: Optional[str] = None, segments: int = 4,
+                       min_size: int = SEGMENT_MIN_SIZE, chunk_size: int = CHUNK_SIZE) -> Optional[str]:
+    """
+    Download a file as several byte ranges fetched in parallel
+
+    The server is probed with a HEAD request first. Files that are too small, or
+    served without Accept-Ranges or Content-Length, go through stream_download.
+    Each range is written at its offset into a preallocated <name>.part file,
+    which is hashed and renamed into place once every range is complete.
+
+    Returns:
+        Optional[str]: SHA-256 hex digest of the file, or None if the server did not answer 200
+    """
+    probe = session.head(file_url, headers={"Accept-Encoding": "identity"}, allow_redirects=True)
+    size = int(probe.headers.get("Content-Length") or 0)
+    if (probe.status_code != 200 or probe.headers.get("Accept-Ranges", "").lower() != "bytes"
+            or size < max(min_size, segments)):
+        return stream_download(session, file_url, file_path, expected_hash, chunk_size)
+
+    validator = probe.headers.get("ETag") or probe.headers.get("Last-Modified")
+    tmp_path = file_path.with_name(file_path.name + ".part")
+    with open(tmp_path, "wb") as f:
+        f.truncate(size)
+
+    segment_size = -(-size // segments)
+    ranges = [(start, min(start + segment_size, size) - 1) for start in range(0, size, segment_size)]
+    try:
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(_fetch_segment, session, probe.url, tmp_path, start, end, validator, chunk_size)
+                for start, end in ranges
+            ]
+            for future in futures:
+                future.result()
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    file_hash = _hash_prefix(tmp_path, size).hexdigest()
+    if expected_hash and file_hash != expected_hash:
+        tmp_path.unlink(missing_ok=True)
+        raise Exception(f"Hash mismatch for {file_url}: expected {expected_hash}, got {file_hash}")
+    os.replace(tmp_path, file_path)
+    return file_hash
+
 def download_files(self, challenge: Challenge, destination: Path, password: str = None) -> List[Path]:
     """
     Download challenge files to the specified directory and handle zip extraction
@@ -18,51 +215,52 @@ def download_files(self, challenge: Challenge, destination: Path, password: str
         List[Path]: List of paths to downloaded/extracted files
     """
     
+    blob_store: Optional[BlobStore] = getattr(self, "blob_store", None)
+    download_segments: int = getattr(self, "download_segments", 1)
+
     for file in challenge.files:
         file_url = file.url
         name = file.name
         name = name.replace("public.yml", ".yml")
+        expected_hash = BlobStore.normalize_hash(getattr(file, "hash", None))
         
         try:
-            response = self.session.get(file_url)
-            if response.status_code == 200:
-                file_path = destination / name
-                file_path.write_bytes(response.content)
-                print(f"Downloaded {name} to {file_path}")
-                
+            file_path = destination / name
+            if blob_store and expected_hash and blob_store.has(expected_hash):
+                blob_store.link_to(expected_hash, file_path)
+                file_hash = expected_hash
+                print(f"Linked {name} from blob store to {file_path}")
+            else:
+                if download_segments > 1:
+                    file_hash = segmented_download(
+                        self.session, file_url, file_path, expected_hash=expected_hash, segments=download_segments
+                    )
+                else:
+                    file_hash = stream_download(self.session, file_url, file_path, expected_hash=expected_hash)
+                if file_hash:
+                    print(f"Downloaded {name} to {file_path}")
+                    if blob_store:
+                        blob_store.add(file_path, file_hash)
+
+            if file_hash:
                 # Handle zip files
                 if name.lower().endswith('.zip'):
                     try:
                         with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                            # Check if zip is password protected
-                            if zip_ref.namelist()[0].endswith('/'):
-                                is_encrypted = False
-                            else:
-                                try:
-                                    zip_ref.read(zip_ref.namelist()[0])
-                                    is_encrypted = False
-                                except RuntimeError:
-                                    is_encrypted = True
-                            
-                            # Extract file
-                            if is_encrypted and password:
-                                zip_ref.extractall(
-                                    path=destination,
-                                    pwd=password.encode('utf-8')
-                                )
+                            encrypted = is_encrypted(zip_ref)
+
+                        if encrypted and not password:
+                            print(f"Zip file {name} is encrypted but no password provided")
+                        else:
+                            extracted = extract_zip(file_path, destination, password if encrypted else None)
+                            if encrypted:
                                 print(f"Extracted encrypted zip {name} with password")
-                            elif not is_encrypted:
-                                zip_ref.extractall(path=destination)
-                                print(f"Extracted zip {name}")
                             else:
-                                print(f"Zip file {name} is encrypted but no password provided")
-                            
-                            for extracted_file in zip_ref.namelist():
-                                extracted_path = destination / extracted_file
-                                if extracted_path.is_file():
-                                    print(f"Extracted file {extracted_file}")
-                    except zipfile.BadZipFile:
-                        raise f"Error: {name} is not a valid zip file or password is incorrect"
+                                print(f"Extracted zip {name}")
+                            for extracted_path in extracted:
+                                print(f"Extracted file {extracted_path.relative_to(destination)}")
+                    except (zipfile.BadZipFile, RuntimeError):
+                        raise Exception(f"Error: {name} is not a valid zip file or password is incorrect")
                 
         except requests.RequestException as e:
             raise Exception(f"Error downloading file {file_url}: {e}")
\ No newline at end of file
@@ -0,0 +1,270 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from datetime import datetime
+from pathlib import Path
+import itertools
+import threading
+import sqlite3
+import json
+
+from ..models import Challenge, File
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS challenges (
+    rowid INTEGER PRIMARY KEY,
+    platform TEXT NOT NULL,
+    id TEXT NOT NULL,
+    url TEXT,
+    name TEXT,
+    author TEXT,
+    category TEXT,
+    description TEXT,
+    difficulty,  -- no type: platforms give names or levels, kept as given
+    points INTEGER,
+    solved_number INTEGER,
+    additional_info TEXT,
+    updated_at TEXT,
+    UNIQUE (platform, id)
+);
+CREATE TABLE IF NOT EXISTS files (
+    platform TEXT NOT NULL,
+    challenge_id TEXT NOT NULL,
+    name TEXT,
+    url TEXT,
+    hash TEXT,
+    FOREIGN KEY (platform, challenge_id) REFERENCES challenges (platform, id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS challenges_platform ON challenges (platform COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS challenges_category ON challenges (category COLLATE NOCASE, points);
+CREATE INDEX IF NOT EXISTS challenges_points ON challenges (points);
+CREATE INDEX IF NOT EXISTS challenges_difficulty ON challenges (difficulty);
+CREATE INDEX IF NOT EXISTS files_challenge ON files (platform, challenge_id);
+"""
+
+# External content table kept in step with challenges by triggers; re-saving
+# an unchanged challenge does not touch the full-text index
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS challenges_fts USING fts5(
+    name, description, content='challenges', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS challenges_fts_insert AFTER INSERT ON challenges BEGIN
+    INSERT INTO challenges_fts (rowid, name, description) VALUES (new.rowid, new.name, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS challenges_fts_delete AFTER DELETE ON challenges BEGIN
+    INSERT INTO challenges_fts (challenges_fts, rowid, name, description)
+    VALUES ('delete', old.rowid, old.name, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS challenges_fts_update AFTER UPDATE OF name, description ON challenges
+WHEN old.name IS NOT new.name OR old.description IS NOT new.description BEGIN
+    INSERT INTO challenges_fts (challenges_fts, rowid, name, description)
+    VALUES ('delete', old.rowid, old.name, old.description);
+    INSERT INTO challenges_fts (rowid, name, description) VALUES (new.rowid, new.name, new.description);
+END;
+"""
+
+UPSERT = """
+INSERT INTO challenges (platform, id, url, name, author, category, description, difficulty,
+                        points, solved_number, additional_info, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (platform, id) DO UPDATE SET
+    url = excluded.url, name = excluded.name, author = excluded.author, category = excluded.category,
+    description = excluded.description, difficulty = excluded.difficulty, points = excluded.points,
+    solved_number = excluded.solved_number, additional_info = excluded.additional_info,
+    updated_at = excluded.updated_at
+"""
+
+COLUMNS = ("platform", "id", "url", "name", "author", "category", "description", "difficulty",
+           "points", "solved_number", "additional_info")
+
+
+def _file_row(challenge: Challenge, file) -> Tuple:
+    if isinstance(file, File):
+        return challenge.platform, challenge.id, file.name, file.url, file.hash
+    # Listings may only give file URLs
+    return challenge.platform, challenge.id, str(file).rstrip('/').split('/')[-1], str(file), None
+
+
+def _fts_query(text: str) -> str:
+    # Each word as an FTS5 string, so "c++" or "don't" are searched, not parsed
+    return " ".join('"' + term.replace('"', '""') + '"' for term in text.split())
+
+
+class ChallengeStore:
+    """
+    Persistent catalog of challenges and their files in a SQLite database
+
+    Challenges are keyed by (platform, id) and indexed on platform, category,
+    points and difficulty; name and description are full-text indexed (FTS5,
+    or LIKE where SQLite was built without it). save() upserts in batches, one
+    transaction per batch, so a whole catalog is written in a few commits.
+    The store may be shared between threads.
+    """
+    def __init__(self, path: str | Path = ":memory:"):
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        # Safe with WAL: a crash may lose the last commits, never corrupt the database
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._connection.executescript(SCHEMA)
+        try:
+            self._connection.executescript(FTS_SCHEMA)
+            self.full_text = True
+        except sqlite3.OperationalError:
+            self.full_text = False
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def save(self, challenges: Iterable[Challenge], batch_size: int = 1000) -> int:
+        """
+        Insert or update challenges and replace their files
+
+        Args:
+            challenges (Iterable[Challenge]): Any iterable, e.g. platform.iter_challenges()
+            batch_size (int): Challenges written per transaction
+
+        Returns:
+            int: Number of challenges saved
+        """
+        saved = 0
+        challenges = iter(challenges)
+        while True:
+            batch = list(itertools.islice(challenges, batch_size))
+            if not batch:
+                return saved
+            self._save_batch(batch)
+            saved += len(batch)
+
+    def _save_batch(self, batch: List[Challenge]):
+        now = datetime.now().isoformat()
+        rows = [
+            (challenge.platform, challenge.id, challenge.url, challenge.name, challenge.author,
+             challenge.category, challenge.description, challenge.difficulty, challenge.points,
+             challenge.solved_number, json.dumps(challenge.additional_info), now)
+            for challenge in batch
+        ]
+        # Listings without files (None) leave the stored files alone
+        with_files = [challenge for challenge in batch if challenge.files is not None]
+        file_rows = [_file_row(challenge, file) for challenge in with_files for file in challenge.files]
+        with self._lock, self._connection:
+            self._connection.executemany(UPSERT, rows)
+            self._connection.executemany(
+                "DELETE FROM files WHERE platform = ? AND challenge_id = ?",
+                [(challenge.platform, challenge.id) for challenge in with_files],
+            )
+            self._connection.executemany(
+                "INSERT INTO files (platform, challenge_id, name, url, hash) VALUES (?, ?, ?, ?, ?)", file_rows)
+
+    def delete(self, platform: str, challenge_ids: Iterable[str]):
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM challenges WHERE platform = ? AND id = ?",
+                [(platform, challenge_id) for challenge_id in challenge_ids],
+            )
+
+    def get(self, platform: str, challenge_id: str) -> Optional[Challenge]:
+        challenges = self._select("c.platform = ? AND c.id = ?", [platform, challenge_id])
+        return challenges[0] if challenges else None
+
+    def query(self, platform: Optional[str] = None, category: Optional[str] = None,
+              min_points: Optional[int] = None, max_points: Optional[int] = None,
+              difficulty=None, max_solved: Optional[int] = None, text: Optional[str] = None,
+              limit: Optional[int] = None) -> List[Challenge]:
+        """
+        Find challenges across platforms
+
+        Args:
+            platform (str, optional): Platform name, case-insensitive
+            category (str, optional): Category, case-insensitive
+            min_points (int, optional), max_points (int, optional): Point bounds, inclusive
+            difficulty (optional): Difficulty as stored by the platform
+            max_solved (int, optional): Most solves, 0 for challenges nobody solved
+            text (str, optional): Words to find in name or description, all of
+                them; results are then ordered by relevance
+            limit (int, optional): Maximum number of results
+
+        Returns:
+            List[Challenge]: Matching challenges with their files
+        """
+        where, params = [], []
+        for condition, value in (
+            ("c.platform = ? COLLATE NOCASE", platform),
+            ("c.category = ? COLLATE NOCASE", category),
+            ("c.points >= ?", min_points),
+            ("c.points <= ?", max_points),
+            ("c.difficulty = ?", difficulty),
+            ("c.solved_number <= ?", max_solved),
+        ):
+            if value is not None:
+                where.append(condition)
+                params.append(value)
+        join, order = "", "c.platform, c.category, c.points"
+        if text and not text.split():
+            text = None
+        if text and self.full_text:
+            join, order = "JOIN challenges_fts ON challenges_fts.rowid = c.rowid", "challenges_fts.rank"
+            where.append("challenges_fts MATCH ?")
+            params.append(_fts_query(text))
+        elif text:
+            where.append("(c.name LIKE ? OR c.description LIKE ?)")
+            params.extend([f"%{text}%", f"%{text}%"])
+        return self._select(" AND ".join(where) or "1", params, join, order, limit)
+
+    def search(self, text: str, **filters) -> List[Challenge]:
+        """Full-text search over name and description, see query for filters"""
+        return self.query(text=text, **filters)
+
+    def count(self, platform: Optional[str] = None) -> int:
+        with self._lock:
+            if platform is None:
+                return self._connection.execute("SELECT COUNT(*) FROM challenges").fetchone()[0]
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM challenges WHERE platform = ? COLLATE NOCASE", (platform,)).fetchone()[0]
+
+    def __iter__(self) -> Iterator[Challenge]:
+        return iter(self._select("1", []))
+
+    def _select(self, where: str, params: List, join: str = "", order: str = "c.rowid",
+                limit: Optional[int] = None) -> List[Challenge]:
+        sql = f"SELECT {', '.join('c.' + column for column in COLUMNS)} FROM challenges c {join} WHERE {where} ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = params + [limit]
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+            files = self._files({(row[0], row[1]) for row in rows})
+        challenges = []
+        for row in rows:
+            values = dict(zip(COLUMNS, row))
+            values["additional_info"] = json.loads(values["additional_info"]) if values["additional_info"] else None
+            values["files"] = files.get((values["platform"], values["id"]), [])
+            challenges.append(Challenge(**values))
+        return challenges
+
+    def _files(self, keys) -> Dict[Tuple[str, str], List[File]]:
+        files: Dict[Tuple[str, str], List[File]] = {}
+        by_platform: Dict[str, List[str]] = {}
+        for platform, challenge_id in sorted(keys):
+            by_platform.setdefault(platform, []).append(challenge_id)
+        # One lookup per platform so the (platform, challenge_id) index is used,
+        # in chunks to stay under SQLite's bound parameter limit
+        for platform, ids in by_platform.items():
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                for challenge_id, name, url, file_hash in self._connection.execute(
+                    f"SELECT challenge_id, name, url, hash FROM files "
+                    f"WHERE platform = ? AND challenge_id IN ({', '.join('?' * len(chunk))}) ORDER BY rowid",
+                    [platform, *chunk],
+                ):
+                    files.setdefault((platform, challenge_id), []).append(File(name=name, url=url, hash=file_hash))
+        return files
@@ -0,0 +1,234 @@
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+from bs4 import Tag
+from .html_parser import compile_selector
+import re
+
+# Selector lists split on commas outside [attribute] tests, compound selectors on whitespace
+_ALTERNATIVE = re.compile(r",(?![^\[]*\])")
+_COMPOUND = re.compile(r"(?:[^\s\[]|\[[^\]]*\])+")
+
+
+def text(element: Tag) -> str:
+    return element.text.strip()
+
+
+def stripped_text(element: Tag) -> str:
+    """get_text(strip=True): every string stripped, then joined"""
+    return element.get_text(strip=True)
+
+
+def element(element: Tag) -> Tag:
+    return element
+
+
+def attribute(name: str) -> Callable[[Tag], Optional[str]]:
+    return lambda element: element.get(name)
+
+
+class Selector:
+    """
+    Comma-separated list of compound selectors, e.g. ".jumbotron h1, th"
+
+    Compound selectors are simple selectors (see html_parser.compile_selector)
+    joined by the descendant combinator, matched right to left.
+    """
+
+    def __init__(self, selector: str):
+        self.selector = selector
+        self.alternatives = []
+        for alternative in _ALTERNATIVE.split(selector):
+            parts = [compile_selector(part) for part in _COMPOUND.findall(alternative)]
+            if not parts:
+                raise Exception(f"Unsupported selector: {selector}")
+            self.alternatives.append(parts)
+        # Tag names the rightmost part can match, None standing for any tag
+        self.names = {parts[-1].name for parts in self.alternatives}
+
+    def matches(self, tag: Tag, root: Tag) -> bool:
+        """Whether tag matches, looking for ancestors up to and including root"""
+        for parts in self.alternatives:
+            if not parts[-1](tag.name, tag.attrs):
+                continue
+            remaining = len(parts) - 2
+            node = tag
+            while remaining >= 0 and node is not root:
+                node = node.parent
+                if node is None:
+                    break
+                if parts[remaining](node.name, node.attrs):
+                    remaining -= 1
+            if remaining < 0:
+                return True
+        return False
+
+
+def _string_matches(tag: Tag, string: Optional[str | Pattern]) -> bool:
+    # Same rule as find(..., string=...): only tags with a single string match
+    if string is None:
+        return True
+    if tag.string is None:
+        return False
+    if isinstance(string, str):
+        return tag.string == string
+    return string.search(tag.string) is not None
+
+
+def _detach(value: Any) -> Any:
+    # NavigableString and attribute value lists keep a reference into the
+    # tree; plain copies let the tree be freed as soon as extraction is done
+    if isinstance(value, str):
+        return value if type(value) is str else str(value)
+    if isinstance(value, list):
+        return [_detach(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_detach(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _detach(item) for key, item in value.items()}
+    return value
+
+
+class Field:
+    """
+    One value of an extraction schema
+
+    Args:
+        selector (str, optional): Elements to match, see Selector
+        get (Callable): Turns a matched element into a value, text() by default
+        post (Callable, optional): Applied to the value, e.g. int
+        many (bool): Keep every match in document order instead of the first
+        optional (bool): Use default when nothing matches instead of raising
+        default: Value of a missing optional field, [] for many fields
+        string (str | Pattern, optional): Only match elements whose string is
+            equal to it, or matches it when a compiled pattern
+        after (tuple, optional): (selector, string) of a label; only elements
+            following the first matching label in document order are kept,
+            like label.find_next(selector)
+        schema (Schema, optional): Extract a nested record from each match
+            instead of calling get
+        path (str, optional): Dotted key path, for schemas applied to JSON
+    """
+
+    def __init__(self, selector: Optional[str] = None, get: Callable[[Tag], Any] = text,
+                 post: Optional[Callable[[Any], Any]] = None, many: bool = False, optional: bool = False,
+                 default: Any = None, string: Optional[str | Pattern] = None,
+                 after: Optional[Tuple[str, Optional[str | Pattern]]] = None,
+                 schema: Optional["Schema"] = None, path: Optional[str] = None):
+        if (selector is None) == (path is None):
+            raise Exception("A field needs exactly one of selector or path")
+        self.selector = Selector(selector) if selector is not None else None
+        self.get = get
+        self.post = post
+        self.many = many
+        self.optional = optional
+        self.default = [] if many and default is None else default
+        self.string = string
+        self.label = Selector(after[0]) if after else None
+        self.label_string = after[1] if after else None
+        self.schema = schema
+        self.path = path.split(".") if path else None
+
+    def finish(self, match: Any) -> Any:
+        value = self.schema.extract(match) if self.schema is not None else self.get(match)
+        return _detach(self.post(value) if self.post else value)
+
+
+class Schema:
+    """
+    Declarative mapping of field names to Fields, compiled once
+
+    extract() walks an HTML tree a single time, testing each element only
+    against the fields whose selector can match its tag name, and stops early
+    once every single-valued field is found. Applied to a dict, as decoded
+    from a JSON API, fields are looked up by their path instead.
+    """
+
+    def __init__(self, **fields: Field):
+        self.fields = fields
+        self._by_name: Dict[Optional[str], List[Tuple[str, Field, bool]]] = {}
+        for key, field in fields.items():
+            roles = [(field.label, True)] if field.label else []
+            if field.selector:
+                roles.append((field.selector, False))
+            for selector, is_label in roles:
+                for name in selector.names:
+                    self._by_name.setdefault(name, []).append((key, field, is_label))
+        self._candidates_cache: Dict[str, List[Tuple[str, Field, bool]]] = {}
+        self._exhaustive = any(field.many for field in fields.values())
+
+    def _candidates(self, name: str) -> List[Tuple[str, Field, bool]]:
+        candidates = self._candidates_cache.get(name)
+        if candidates is None:
+            candidates = self._by_name.get(name, []) + self._by_name.get(None, [])
+            self._candidates_cache[name] = candidates
+        return candidates
+
+    def _missing(self, key: str, field: Field) -> Any:
+        if field.optional or field.many:
+            return field.default
+        what = field.selector.selector if field.selector else ".".join(field.path)
+        raise Exception(f"Missing field {key} ({what})")
+
+    def extract(self, source: Tag | Dict) -> Dict[str, Any]:
+        """
+        Extract every field from source
+
+        Args:
+            source (Tag | Dict): Parsed page or element, or decoded JSON
+
+        Returns:
+            Dict[str, Any]: Field names to values
+        """
+        if isinstance(source, dict):
+            return self._extract_json(source)
+        return self._extract_html(source)
+
+    def _extract_json(self, source: Dict) -> Dict[str, Any]:
+        values = {}
+        for key, field in self.fields.items():
+            value = source
+            try:
+                for part in field.path:
+                    value = value[part]
+            except (KeyError, IndexError, TypeError):
+                values[key] = self._missing(key, field)
+                continue
+            values[key] = field.post(value) if field.post else value
+        return values
+
+    def _extract_html(self, root: Tag) -> Dict[str, Any]:
+        found: Dict[str, List[Tag]] = {key: [] for key in self.fields}
+        armed = set()
+        remaining = sum(1 for field in self.fields.values() if not field.many)
+
+        for node in root.descendants:
+            if not isinstance(node, Tag):
+                continue
+            armed_now = set()
+            for key, field, is_label in self._candidates(node.name):
+                if is_label:
+                    if (key not in armed and field.label.matches(node, root)
+                            and _string_matches(node, field.label_string)):
+                        armed.add(key)
+                        armed_now.add(key)
+                    continue
+                if field.label and (key not in armed or key in armed_now):
+                    continue
+                if not field.many and found[key]:
+                    continue
+                if field.selector.matches(node, root) and _string_matches(node, field.string):
+                    found[key].append(node)
+                    if not field.many:
+                        remaining -= 1
+            if not remaining and not self._exhaustive:
+                break
+
+        values = {}
+        for key, field in self.fields.items():
+            matches = found[key]
+            if field.many:
+                values[key] = [field.finish(match) for match in matches]
+            elif matches:
+                values[key] = field.finish(matches[0])
+            else:
+                values[key] = self._missing(key, field)
+        return values
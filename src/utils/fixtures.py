@@ -0,0 +1,177 @@
+from typing import Dict, List, Optional, Tuple
+from collections import defaultdict
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from requests.models import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from typing import BinaryIO
+import threading
+import tempfile
+import requests
+import hashlib
+import zipfile
+import shutil
+import json
+import time
+import io
+
+# Bodies are stored decoded, so these headers no longer describe them
+_DROPPED_HEADERS = ("content-encoding", "transfer-encoding", "content-length")
+# Session credentials never reach an archive; matching does not use them
+_REDACTED_HEADERS = ("cookie", "set-cookie", "authorization", "proxy-authorization")
+REDACTED = "<redacted>"
+CHUNK_SIZE = 1024 * 1024
+
+
+def _body_digest(body) -> str:
+    if body is None:
+        return ""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return hashlib.sha256(body).hexdigest()
+
+
+def _request_key(request: PreparedRequest) -> Tuple[str, str, str]:
+    return request.method, request.url, _body_digest(request.body)
+
+
+def _redact(headers) -> Dict[str, str]:
+    return {k: REDACTED if k.lower() in _REDACTED_HEADERS else v for k, v in headers.items()}
+
+
+class FixtureWriter:
+    """
+    Append-only fixture archive
+
+    The archive is a zip file with one entries/<n>.json member per exchange
+    (request, status, headers) and bodies/<sha256> members holding each
+    distinct response body once. The zip is reopened for every exchange, so
+    the archive stays valid if the run is interrupted. Cookie, Set-Cookie
+    and Authorization values are replaced by a placeholder.
+    """
+    def __init__(self, archive_path: str | Path):
+        self.archive_path = Path(archive_path)
+        self.archive_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        with zipfile.ZipFile(self.archive_path, "a", compression=zipfile.ZIP_DEFLATED) as archive:
+            names = archive.namelist()
+        self._bodies = {name.split("/", 1)[1] for name in names if name.startswith("bodies/")}
+        self._count = sum(1 for name in names if name.startswith("entries/"))
+
+    def write(self, request: PreparedRequest, response: Response, body: bytes):
+        self.write_file(request, response, io.BytesIO(body), hashlib.sha256(body).hexdigest())
+
+    def write_file(self, request: PreparedRequest, response: Response, body: BinaryIO, body_hash: str):
+        """Record an exchange whose body is read from a file object, in chunks"""
+        entry = {
+            "method": request.method,
+            "url": request.url,
+            "request_body": _body_digest(request.body),
+            "request_headers": _redact(request.headers),
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "response_url": response.url,
+            "headers": _redact(response.headers),
+            "body": body_hash,
+            "elapsed": response.elapsed.total_seconds(),
+        }
+        with self._lock, zipfile.ZipFile(self.archive_path, "a", compression=zipfile.ZIP_DEFLATED) as archive:
+            if entry["body"] not in self._bodies:
+                with archive.open(f"bodies/{entry['body']}", "w", force_zip64=True) as member:
+                    shutil.copyfileobj(body, member, CHUNK_SIZE)
+                self._bodies.add(entry["body"])
+            archive.writestr(f"entries/{self._count:06d}.json", json.dumps(entry))
+            self._count += 1
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    Transport adapter saving every exchange through a FixtureWriter
+
+    Streamed responses are spooled to a temporary file in chunks, stored from
+    it, then served to the caller from it, so large downloads are never held
+    in memory.
+    """
+    def __init__(self, writer: FixtureWriter, adapter: Optional[HTTPAdapter] = None):
+        super().__init__()
+        self.writer = writer
+        self.adapter = adapter or HTTPAdapter()
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        response = self.adapter.send(request, **kwargs)
+        if not kwargs.get("stream"):
+            self.writer.write(request, response, response.content)
+            return response
+
+        spool = tempfile.TemporaryFile()
+        digest = hashlib.sha256()
+        for chunk in response.iter_content(CHUNK_SIZE):
+            spool.write(chunk)
+            digest.update(chunk)
+        spool.seek(0)
+        self.writer.write_file(request, response, spool, digest.hexdigest())
+        spool.seek(0)
+        # Body already decoded: iter_content now reads the spool as is
+        response.raw = spool
+        response._content_consumed = False
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    Transport adapter answering from a fixture archive without any network
+
+    Requests are matched on method, URL and request body. When the same request
+    was recorded several times the answers are replayed in order, the last one
+    repeating. latency adds a fixed delay per request; with latency="recorded"
+    the delay observed while recording is reproduced.
+    """
+    def __init__(self, archive_path: str | Path, latency: float | str = 0.0):
+        super().__init__()
+        self.latency = latency
+        self.entries: Dict[Tuple[str, str, str], List[Dict]] = defaultdict(list)
+        self.bodies: Dict[str, bytes] = {}
+        self._served: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self._lock = threading.Lock()
+        with zipfile.ZipFile(archive_path) as archive:
+            for name in sorted(archive.namelist()):
+                if name.startswith("entries/"):
+                    entry = json.loads(archive.read(name))
+                    self.entries[(entry["method"], entry["url"], entry["request_body"])].append(entry)
+                elif name.startswith("bodies/"):
+                    self.bodies[name.split("/", 1)[1]] = archive.read(name)
+
+    def send(self, request: PreparedRequest, stream=False, **kwargs) -> Response:
+        key = _request_key(request)
+        with self._lock:
+            recorded = self.entries.get(key)
+            if not recorded:
+                raise requests.ConnectionError(f"No recorded response for {request.method} {request.url}", request=request)
+            entry = recorded[min(self._served[key], len(recorded) - 1)]
+            self._served[key] += 1
+
+        delay = entry.get("elapsed", 0.0) if self.latency == "recorded" else self.latency
+        if delay:
+            time.sleep(delay)
+
+        body = self.bodies[entry["body"]]
+        response = Response()
+        response.status_code = entry["status_code"]
+        response.reason = entry.get("reason")
+        response.headers = CaseInsensitiveDict(
+            {k: v for k, v in entry["headers"].items() if k.lower() not in _DROPPED_HEADERS}
+        )
+        response.headers["Content-Length"] = str(len(body))
+        response.raw = io.BytesIO(body)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = entry.get("response_url") or request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
@@ -0,0 +1,103 @@
+from typing import Dict, Optional
+from collections import deque
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from requests.adapters import HTTPAdapter
+from requests.models import PreparedRequest, Response
+import threading
+import time
+
+# Shared by every adapter, as several adapters may update the same stats dict
+_stats_lock = threading.Lock()
+
+
+class HedgeStats:
+    """Latency history and hedging counters for one host"""
+    def __init__(self, history: int = 200):
+        self.latencies = deque(maxlen=history)
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def delay(self, percentile: float, min_samples: int, default: float) -> float:
+        if len(self.latencies) < min_samples:
+            return default
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
+
+    def as_dict(self) -> Dict:
+        return {"requests": self.requests, "hedged": self.hedged, "hedge_wins": self.hedge_wins}
+
+
+def _close_response(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+class HedgingAdapter(HTTPAdapter):
+    """
+    Transport adapter sending a second copy of slow GET requests
+
+    When a GET has not answered after the host's latency percentile (or
+    default_delay until min_samples answers were seen), the same request is
+    sent again and the first successful answer wins. The losing request cannot
+    be interrupted mid-flight, so its response is closed as soon as it arrives.
+    Streamed requests (file downloads) are never hedged.
+    """
+    def __init__(self, adapter: Optional[HTTPAdapter] = None, percentile: float = 95,
+                 min_samples: int = 20, default_delay: float = 2.0, max_workers: int = 16,
+                 stats: Optional[Dict[str, HedgeStats]] = None):
+        super().__init__()
+        self.adapter = adapter or HTTPAdapter()
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.default_delay = default_delay
+        self.stats: Dict[str, HedgeStats] = stats if stats is not None else {}
+        self._lock = _stats_lock
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+
+    def _stats(self, host: str) -> HedgeStats:
+        with self._lock:
+            if host not in self.stats:
+                self.stats[host] = HedgeStats()
+            return self.stats[host]
+
+    def send(self, request: PreparedRequest, stream=False, **kwargs) -> Response:
+        if request.method != "GET" or stream:
+            return self.adapter.send(request, stream=stream, **kwargs)
+
+        stats = self._stats(urlparse(request.url).hostname or "")
+        with self._lock:
+            stats.requests += 1
+            delay = stats.delay(self.percentile, self.min_samples, self.default_delay)
+
+        start = time.monotonic()
+        primary = self._executor.submit(self.adapter.send, request, stream=stream, **kwargs)
+        done, _ = wait([primary], timeout=delay)
+        if not done:
+            hedge = self._executor.submit(self.adapter.send, request.copy(), stream=stream, **kwargs)
+            with self._lock:
+                stats.hedged += 1
+            done, _ = wait([primary, hedge], return_when=FIRST_COMPLETED)
+            winner = done.pop()
+            # A failed copy only loses if the other one can still succeed
+            if winner.exception() is not None:
+                winner = hedge if winner is primary else primary
+                winner.exception()
+            loser = hedge if winner is primary else primary
+            loser.add_done_callback(_close_response)
+            if winner is hedge and winner.exception() is None:
+                with self._lock:
+                    stats.hedge_wins += 1
+        else:
+            winner = primary
+
+        response = winner.result()
+        with self._lock:
+            stats.latencies.append(time.monotonic() - start)
+        return response
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.adapter.close()
@@ -0,0 +1,209 @@
+from typing import Dict, Iterable, Optional
+from collections import OrderedDict
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from requests.models import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+import tempfile
+import hashlib
+import threading
+import json
+import time
+import os
+
+# Pages differ per session: the cookie is part of the key (only as a digest,
+# like every header value), so anonymous and logged-in pages never mix
+DEFAULT_VARY_HEADERS = ("accept", "accept-language", "authorization", "cookie")
+# Headers of a 304 that describe the (empty) answer rather than the stored body
+_NOT_MERGED_HEADERS = ("content-length", "content-encoding", "transfer-encoding", "content-type")
+# Entries are read and written under one of these locks, picked by key
+_KEY_LOCK_STRIPES = 64
+
+
+class ResponseCache:
+    """
+    On-disk store for HTTP responses with LRU eviction by total size
+
+    Each entry is a pair of files in the cache directory: <key>.json holds the
+    status, headers and validators, <key>.body holds the raw body. Both are
+    written to unique temp files and renamed into place, under a per-key lock,
+    so concurrent requests for the same URL never see a half-written entry.
+    """
+    def __init__(self, cache_dir: str | Path, max_size: int = 512 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._key_locks = [threading.Lock() for _ in range(_KEY_LOCK_STRIPES)]
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._size = 0
+        self._load_index()
+
+    def _load_index(self):
+        entries = []
+        for meta_path in self.cache_dir.glob("*.json"):
+            body_path = meta_path.with_suffix(".body")
+            if not body_path.exists():
+                meta_path.unlink(missing_ok=True)
+                continue
+            stat = body_path.stat()
+            entries.append((stat.st_atime, meta_path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._size += size
+
+    @staticmethod
+    def make_key(method: str, url: str, headers: Dict[str, str], vary_headers: Iterable[str]) -> str:
+        parts = [method.upper(), url]
+        lowered = {k.lower(): v for k, v in headers.items()}
+        for name in vary_headers:
+            parts.append(f"{name}={lowered.get(name, '')}")
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        return self._key_locks[int(key[:8], 16) % _KEY_LOCK_STRIPES]
+
+    def _write_atomic(self, path: Path, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the stored entry (metadata plus 'content') or None"""
+        with self._lock:
+            if key not in self._index:
+                return None
+            self._index.move_to_end(key)
+        try:
+            with self._key_lock(key):
+                meta = json.loads((self.cache_dir / f"{key}.json").read_text())
+                meta["content"] = (self.cache_dir / f"{key}.body").read_bytes()
+        except (OSError, ValueError):
+            self.delete(key)
+            return None
+        try:
+            os.utime(self.cache_dir / f"{key}.body")
+        except OSError:
+            pass
+        return meta
+
+    def put(self, key: str, meta: Dict, content: bytes):
+        if len(content) > self.max_size:
+            return
+        with self._key_lock(key):
+            self._write_atomic(self.cache_dir / f"{key}.body", content)
+            self._write_atomic(self.cache_dir / f"{key}.json", json.dumps(meta).encode("utf-8"))
+        with self._lock:
+            self._size -= self._index.pop(key, 0)
+            self._index[key] = len(content)
+            self._size += len(content)
+            evicted = self._evict()
+        for old_key in evicted:
+            self._remove_files(old_key)
+
+    def touch(self, key: str, meta: Dict):
+        """Update metadata of an entry after a successful revalidation"""
+        with self._key_lock(key):
+            self._write_atomic(self.cache_dir / f"{key}.json", json.dumps(meta).encode("utf-8"))
+
+    def delete(self, key: str):
+        with self._lock:
+            self._size -= self._index.pop(key, 0)
+        self._remove_files(key)
+
+    def _evict(self):
+        evicted = []
+        while self._size > self.max_size and self._index:
+            key, size = self._index.popitem(last=False)
+            self._size -= size
+            evicted.append(key)
+        return evicted
+
+    def _remove_files(self, key: str):
+        with self._key_lock(key):
+            (self.cache_dir / f"{key}.json").unlink(missing_ok=True)
+            (self.cache_dir / f"{key}.body").unlink(missing_ok=True)
+
+
+class CachingAdapter(HTTPAdapter):
+    """
+    Transport adapter serving GET requests from a ResponseCache
+
+    Fresh entries (younger than ttl seconds) are returned without touching the
+    network. Stale entries are revalidated with If-None-Match/If-Modified-Since,
+    and a 304 answer is turned back into the cached 200 response, its headers
+    (ETag, Cache-Control, Date...) replacing the stored ones. Streamed
+    requests (file downloads) bypass the cache.
+    """
+    def __init__(self, cache: ResponseCache, adapter: Optional[HTTPAdapter] = None,
+                 ttl: float = 24 * 3600, vary_headers: Iterable[str] = DEFAULT_VARY_HEADERS):
+        super().__init__()
+        self.cache = cache
+        self.adapter = adapter or HTTPAdapter()
+        self.ttl = ttl
+        self.vary_headers = tuple(h.lower() for h in vary_headers)
+
+    def send(self, request: PreparedRequest, stream=False, **kwargs) -> Response:
+        if request.method != "GET" or stream:
+            return self.adapter.send(request, stream=stream, **kwargs)
+
+        key = self.cache.make_key(request.method, request.url, request.headers, self.vary_headers)
+        entry = self.cache.get(key)
+        if entry and time.time() - entry["stored_at"] < self.ttl:
+            return self._build_response(request, entry)
+
+        if entry:
+            if entry["headers"].get("ETag"):
+                request.headers["If-None-Match"] = entry["headers"]["ETag"]
+            if entry["headers"].get("Last-Modified"):
+                request.headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+
+        response = self.adapter.send(request, stream=stream, **kwargs)
+
+        if entry and response.status_code == 304:
+            response.close()
+            headers = CaseInsensitiveDict(entry["headers"])
+            for name, value in response.headers.items():
+                if name.lower() not in _NOT_MERGED_HEADERS:
+                    headers[name] = value
+            entry["headers"] = dict(headers)
+            entry["stored_at"] = time.time()
+            content = entry.pop("content")
+            self.cache.touch(key, entry)
+            entry["content"] = content
+            return self._build_response(request, entry)
+
+        if response.status_code == 200 and "no-store" not in response.headers.get("Cache-Control", ""):
+            meta = {
+                "url": response.url,
+                "status_code": response.status_code,
+                "reason": response.reason,
+                "headers": dict(response.headers),
+                "stored_at": time.time(),
+            }
+            self.cache.put(key, meta, response.content)
+        return response
+
+    def _build_response(self, request: PreparedRequest, entry: Dict) -> Response:
+        response = Response()
+        response.status_code = entry["status_code"]
+        response.reason = entry.get("reason")
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        # The body is stored decoded, so the transfer encoding no longer applies
+        response.headers.pop("Content-Encoding", None)
+        response._content = entry["content"]
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = entry.get("url", request.url)
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+        return response
+
+    def close(self):
+        self.adapter.close()
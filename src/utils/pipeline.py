@@ -0,0 +1,99 @@
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+import tracemalloc
+import threading
+import queue
+
+_DONE = object()
+
+
+class Pipeline:
+    """
+    Run items through a chain of stages connected by bounded queues
+
+    Each stage has its own pool of worker threads, so different stages work on
+    different items at the same time. Queues are bounded, so a slow stage makes
+    the earlier ones block instead of buffering the whole input in memory.
+    A stage returning None drops the item; an exception is recorded in
+    self.errors as (stage_name, item, exception) and the item is dropped.
+    While tracemalloc is tracing, self.memory_peaks records per stage the
+    highest traced memory seen right after one of its items finished.
+    """
+    def __init__(self, queue_size: int = 8):
+        self.queue_size = queue_size
+        self.stages: List[Tuple[str, Callable[[Any], Any], int]] = []
+        self.errors: List[Tuple[str, Any, Exception]] = []
+        self.memory_peaks: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add_stage(self, name: str, func: Callable[[Any], Any], workers: int = 1) -> "Pipeline":
+        """Append a stage running func on each item with the given number of workers"""
+        self.stages.append((name, func, max(1, workers)))
+        return self
+
+    def run(self, items: Iterable) -> int:
+        """Feed items through every stage and return the number that reached the end"""
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        completed = [0]
+        stage_threads = []
+
+        for index, (name, func, workers) in enumerate(self.stages):
+            inbox = queues[index]
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+            threads = [
+                threading.Thread(
+                    target=self._worker,
+                    args=(name, func, inbox, outbox, completed),
+                    name=f"pipeline-{name}-{n}",
+                    daemon=True,
+                )
+                for n in range(workers)
+            ]
+            for thread in threads:
+                thread.start()
+            stage_threads.append(threads)
+
+        # items may be a lazy listing: stages start working on the first ones
+        # while the rest are still being produced, and are closed even if
+        # producing them fails
+        try:
+            for item in items:
+                queues[0].put(item)
+        finally:
+            # Close stages in order: once every worker of a stage has exited, the
+            # next stage will not receive anything else.
+            for index, threads in enumerate(stage_threads):
+                for _ in threads:
+                    queues[index].put(_DONE)
+                for thread in threads:
+                    thread.join()
+
+        return completed[0]
+
+    def _worker(self, name, func, inbox, outbox, completed):
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+            try:
+                result = func(item)
+            except Exception as e:
+                with self._lock:
+                    self.errors.append((name, item, e))
+                print(f"Error in {name} stage: {e}")
+                continue
+            finally:
+                if tracemalloc.is_tracing():
+                    self._sample_memory(name)
+            if result is None:
+                continue
+            if outbox is not None:
+                outbox.put(result)
+            else:
+                with self._lock:
+                    completed[0] += 1
+
+    def _sample_memory(self, name: str):
+        current = tracemalloc.get_traced_memory()[0]
+        with self._lock:
+            if current > self.memory_peaks.get(name, 0):
+                self.memory_peaks[name] = current
@@ -0,0 +1,142 @@
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from requests.models import PreparedRequest, Response
+import threading
+import time
+
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Allow rate requests per second on average, with bursts of up to burst requests"""
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on the number of requests in flight to one host
+
+    The limit grows by 1/limit on every fast answer (about +1 per round of
+    requests) and is halved on 429/503. A Retry-After header pauses the host
+    entirely until it expires.
+    """
+    def __init__(self, initial: int = 2, minimum: int = 1, maximum: int = 8, latency_target: float = 2.0):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while True:
+                wait = self.blocked_until - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                elif self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                else:
+                    self._cond.wait()
+
+    def release(self, status_code: Optional[int], latency: float, retry_after: Optional[float] = None):
+        with self._cond:
+            self.in_flight -= 1
+            if status_code in THROTTLE_STATUS_CODES:
+                self.limit = max(self.minimum, self.limit / 2)
+                if retry_after:
+                    self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+            elif status_code is not None and latency <= self.latency_target:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+class HostRateLimiter:
+    """Token bucket plus adaptive concurrency, kept separately for every host"""
+    def __init__(self, rate: float = 5.0, burst: int = 5, max_concurrency: int = 8, latency_target: float = 2.0):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.concurrency: Dict[str, AdaptiveConcurrency] = {}
+        self._lock = threading.Lock()
+
+    def _for_host(self, host: str):
+        with self._lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.rate, self.burst)
+                self.concurrency[host] = AdaptiveConcurrency(
+                    initial=min(2, self.max_concurrency),
+                    maximum=self.max_concurrency,
+                    latency_target=self.latency_target,
+                )
+            return self.buckets[host], self.concurrency[host]
+
+    def acquire(self, host: str) -> AdaptiveConcurrency:
+        bucket, concurrency = self._for_host(host)
+        concurrency.acquire()
+        bucket.acquire()
+        return concurrency
+
+
+class RateLimitAdapter(HTTPAdapter):
+    """Transport adapter sending every request through a HostRateLimiter"""
+    def __init__(self, limiter: HostRateLimiter, adapter: Optional[HTTPAdapter] = None):
+        super().__init__()
+        self.limiter = limiter
+        self.adapter = adapter or HTTPAdapter()
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        host = urlparse(request.url).hostname or ""
+        concurrency = self.limiter.acquire(host)
+        start = time.monotonic()
+        try:
+            response = self.adapter.send(request, **kwargs)
+        except BaseException:
+            concurrency.release(None, time.monotonic() - start)
+            raise
+        concurrency.release(
+            response.status_code,
+            time.monotonic() - start,
+            parse_retry_after(response.headers.get("Retry-After")),
+        )
+        return response
+
+    def close(self):
+        self.adapter.close()
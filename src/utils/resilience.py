@@ -0,0 +1,126 @@
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from requests.models import PreparedRequest, Response
+from .rate_limiter import parse_retry_after
+import threading
+import requests
+import random
+import time
+
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without any network access while a host's circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one host
+
+    After failure_threshold failures in a row the circuit opens and requests
+    fail immediately for reset_timeout seconds. Then a single trial request is
+    let through: success closes the circuit, failure opens it again.
+    """
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout or self.trial_in_flight:
+                return False
+            self.trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class ResilientAdapter(HTTPAdapter):
+    """
+    Transport adapter adding default timeouts, retries and per-host circuit breakers
+
+    Only idempotent methods are retried, on connection errors, timeouts and
+    RETRY_STATUS_CODES, with full-jitter exponential backoff (or the server's
+    Retry-After when larger). The last response or error is returned as is.
+    """
+    def __init__(self, adapter: Optional[HTTPAdapter] = None, timeout: Tuple[float, float] = (10.0, 30.0),
+                 retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0):
+        super().__init__()
+        self.adapter = adapter or HTTPAdapter()
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self.breakers[host]
+
+    def _backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        return max(delay, min(retry_after or 0, self.backoff_max))
+
+    def send(self, request: PreparedRequest, timeout=None, **kwargs) -> Response:
+        host = urlparse(request.url).hostname or ""
+        breaker = self.breaker(host)
+        retries = self.retries if request.method in IDEMPOTENT_METHODS else 0
+        timeout = timeout if timeout is not None else self.timeout
+
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {host}, skipping {request.url}", request=request)
+            try:
+                response = self.adapter.send(request, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                breaker.record_failure()
+                if attempt >= retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            except Exception:
+                # Any other error still counts, and frees the half-open trial slot
+                breaker.record_failure()
+                raise
+
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= retries:
+                return response
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            response.close()
+            time.sleep(self._backoff(attempt, retry_after))
+            attempt += 1
+
+    def close(self):
+        self.adapter.close()
@@ -0,0 +1,115 @@
+from typing import BinaryIO, Optional
+import zipfile
+import struct
+import zlib
+
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+BLOCK_SIZE = 256 * 1024
+
+_crc_table = None
+_keystream_table = None
+
+
+def _tables():
+    """Build the CRC-32 table and the keystream byte for every low half of key2"""
+    global _crc_table, _keystream_table
+    if _crc_table is None:
+        crc_table = []
+        for n in range(256):
+            crc = n
+            for _ in range(8):
+                crc = (crc >> 1) ^ 0xEDB88320 if crc & 1 else crc >> 1
+            crc_table.append(crc)
+        keystream = bytearray(65536)
+        for k in range(65536):
+            t = k | 2
+            keystream[k] = ((t * (t ^ 1)) >> 8) & 0xFF
+        _crc_table = tuple(crc_table)
+        _keystream_table = bytes(keystream)
+    return _crc_table, _keystream_table
+
+
+class ZipCryptoDecrypter:
+    """
+    Traditional PKWARE (ZipCrypto) stream decrypter
+
+    Same algorithm as zipfile._ZipDecrypter, but the keystream byte comes from a
+    65536-entry table indexed by the low half of key2 and the three key updates
+    are inlined in a single loop over each block, with no per-byte function call.
+    """
+    def __init__(self, pwd: bytes):
+        self.key0 = 305419896
+        self.key1 = 591751049
+        self.key2 = 878082192
+        crc_table, _ = _tables()
+        key0, key1, key2 = self.key0, self.key1, self.key2
+        for c in pwd:
+            key0 = (key0 >> 8) ^ crc_table[(key0 ^ c) & 0xFF]
+            key1 = ((key1 + (key0 & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+            key2 = (key2 >> 8) ^ crc_table[(key2 ^ (key1 >> 24)) & 0xFF]
+        self.key0, self.key1, self.key2 = key0, key1, key2
+
+    def __call__(self, data: bytes | bytearray | memoryview) -> bytes:
+        crc_table, keystream = _tables()
+        key0, key1, key2 = self.key0, self.key1, self.key2
+        out = bytearray(len(data))
+        i = 0
+        for c in data:
+            c ^= keystream[key2 & 0xFFFF]
+            out[i] = c
+            i += 1
+            key0 = (key0 >> 8) ^ crc_table[(key0 ^ c) & 0xFF]
+            key1 = ((key1 + (key0 & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+            key2 = (key2 >> 8) ^ crc_table[(key2 ^ (key1 >> 24)) & 0xFF]
+        self.key0, self.key1, self.key2 = key0, key1, key2
+        return bytes(out)
+
+
+def supports(info: zipfile.ZipInfo) -> bool:
+    """Whether decrypt_member can handle this member"""
+    return bool(info.flag_bits & 0x1) and info.compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+
+
+def decrypt_member(archive: BinaryIO, info: zipfile.ZipInfo, pwd: bytes, dest: BinaryIO,
+                   block_size: int = BLOCK_SIZE):
+    """
+    Decrypt and decompress a ZipCrypto member of archive into dest
+
+    The member is processed block by block, so memory use is bounded by
+    block_size. The password check byte and the CRC-32 are verified like
+    zipfile does, raising RuntimeError on a bad password and BadZipFile on
+    corrupt data.
+    """
+    archive.seek(info.header_offset)
+    header = _LOCAL_HEADER.unpack(archive.read(_LOCAL_HEADER.size))
+    if header[0] != _LOCAL_HEADER_SIGNATURE:
+        raise zipfile.BadZipFile(f"Bad local file header for {info.filename}")
+    archive.seek(header[10] + header[11], 1)
+
+    decrypter = ZipCryptoDecrypter(pwd)
+    encryption_header = decrypter(archive.read(12))
+    # With a data descriptor (bit 3) the check byte is the high byte of the DOS time
+    check_byte = (info._raw_time >> 8) & 0xFF if info.flag_bits & 0x8 else (info.CRC >> 24) & 0xFF
+    if encryption_header[11] != check_byte:
+        raise RuntimeError(f"Bad password for file {info.filename!r}")
+
+    decompressor = zlib.decompressobj(-15) if info.compress_type == zipfile.ZIP_DEFLATED else None
+    remaining = info.compress_size - 12
+    crc = 0
+    while remaining > 0:
+        block = archive.read(min(block_size, remaining))
+        if not block:
+            raise EOFError(f"Truncated data for {info.filename}")
+        remaining -= len(block)
+        data = decrypter(block)
+        if decompressor is not None:
+            data = decompressor.decompress(data)
+        crc = zlib.crc32(data, crc)
+        dest.write(data)
+    if decompressor is not None:
+        data = decompressor.flush()
+        crc = zlib.crc32(data, crc)
+        dest.write(data)
+    if crc != info.CRC:
+        raise zipfile.BadZipFile(f"Bad CRC-32 for file {info.filename!r}")